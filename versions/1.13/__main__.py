@@ -5,6 +5,10 @@ images_dir = __file__.replace("__main__.py", "images")
 os.chdir(images_dir)
 del images_dir
 
+from stratego.atlas import start_loading
+# Start loading the gamepiece images right away, so that they are ready
+# (or nearly so) by the time the players start setting up their pieces.
+start_loading()
 from stratego.players import Player, pygame
 from stratego.boards import Board
 from stratego.backend import exit_game
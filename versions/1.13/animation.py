@@ -0,0 +1,108 @@
+"""
+Time-based animations for ``stratego``.
+
+Animations are driven by how much time has passed rather than by how many
+frames have been drawn, so they take the same amount of time no matter how
+fast or slow the computer is at drawing.
+"""
+from stratego.backend import pygame
+from stratego.scheduler import get_events
+
+TARGET_FPS = 60
+# How fast gamepieces move, in pixels per millisecond, and how long a move
+# may take at the least and at the most, in milliseconds. Long moves (like
+# a Scout crossing the board) are sped up so they never take longer than
+# ``MAX_MOVE_DURATION``.
+MOVE_SPEED = 0.5
+MIN_MOVE_DURATION = 150
+MAX_MOVE_DURATION = 450
+
+
+def linear(progress, /):
+    """Move at the same speed the whole way."""
+    return progress
+
+
+def ease_in_out(progress, /):
+    """Start slowly, speed up in the middle, and slow down at the end."""
+    if progress < 0.5:
+        return 4 * progress ** 3
+    return 1 - (-2 * progress + 2) ** 3 / 2
+
+
+def ease_out(progress, /):
+    """Start quickly and slow down at the end."""
+    return 1 - (1 - progress) ** 3
+
+
+def get_move_duration(distance, /):
+    """
+    Return how long, in milliseconds, it should take to move the given
+    distance in pixels.
+    """
+    duration = abs(distance) / MOVE_SPEED
+    return max(MIN_MOVE_DURATION, min(duration, MAX_MOVE_DURATION))
+
+
+class Tween:
+    """
+    A value going from ``start`` to ``end`` over ``duration`` milliseconds.
+
+    Parameters
+    ----------
+    start, end:
+        The values at the beginning and the end of the animation. They can
+        be numbers or tuples of numbers (such as coordinates).
+    duration:
+        How long the animation takes, in milliseconds.
+    easing=ease_in_out:
+        A function that takes the fraction of ``duration`` that has passed
+        (from 0 to 1) and returns how far along the value should be (also
+        from 0 to 1).
+    """
+    def __init__(self, /, start, end, duration, easing=ease_in_out):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+
+    def progress(self, /, elapsed):
+        """Return the eased progress after ``elapsed`` milliseconds."""
+        if self.duration <= 0 or elapsed >= self.duration:
+            return 1
+        return self.easing(max(elapsed, 0) / self.duration)
+
+    def value(self, /, elapsed):
+        """Return the value after ``elapsed`` milliseconds."""
+        progress = self.progress(elapsed)
+        if progress == 1:
+            return self.end
+        if isinstance(self.start, tuple):
+            return tuple(start + (end - start) * progress
+                         for start, end in zip(self.start, self.end))
+        return self.start + (self.end - self.start) * progress
+
+    def done(self, /, elapsed):
+        """Return True if the animation is over after ``elapsed`` ms."""
+        return elapsed >= self.duration
+
+
+def run(tween, step, /, fps=TARGET_FPS):
+    """
+    Play an animation, calling ``step`` with the tween's current value once
+    per frame, at no more than ``fps`` frames per second.
+
+    The last call to ``step`` is always with ``tween.end``, so the
+    animation always finishes exactly where it should, however few frames
+    there were time for. Events that come in during the animation are
+    thrown away.
+    """
+    clock = pygame.time.Clock()
+    start_time = pygame.time.get_ticks()
+    while True:
+        get_events(0)
+        elapsed = pygame.time.get_ticks() - start_time
+        step(tween.value(elapsed))
+        if tween.done(elapsed):
+            return
+        clock.tick(fps)
@@ -0,0 +1,201 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from stratego.images import (
+    pygame,
+    get_gamepiece_img,
+    get_lightened_img,
+    get_mirrored_img,
+    decode_images,
+    finalize_images,
+    prepare_surface,
+    GAMEPIECE_WIDTH,
+    GAMEPIECE_HEIGHT,
+    PIECE_NAMES,
+    SHEET_FILENAMES
+)
+
+
+class Atlas:
+    """
+    All the different views of all the gamepieces of one color, drawn onto
+    a single ``pygame.Surface``.
+
+    Each row of the atlas holds one view of the twelve ranks, in the order
+    of ``stratego.images.PIECE_NAMES``. The row numbers are the same as the
+    ``view`` numbers used by ``stratego.gamepieces.Gamepiece``, so a piece
+    can be drawn with a single blit:
+
+    >>> atlas = Atlas.get(Colors.PLAYER_RED)
+    >>> display.blit(atlas.surface, (x, y), atlas.rect(Atlas.NORMAL, "Spy"))
+
+    Use ``Atlas.get()`` instead of creating ``Atlas`` objects directly, so
+    that each color's atlas is only built once.
+    """
+    LIGHTENED = 0
+    NORMAL = 1
+    BACK_VIEW = 2
+    MIRRORED = 3
+    VIEWS = LIGHTENED, NORMAL, BACK_VIEW, MIRRORED
+
+    atlases = {}
+    # Scaled copies of the atlases, keyed by color. Only one size is kept
+    # for each color, as the size only changes with the display.
+    scaled = {}
+
+    def __init__(self, /, color, source=None, size=None):
+        """
+        Build the atlas of the given color, either from the gamepiece
+        images, or, if ``source`` is given, by scaling each piece of the
+        ``source`` atlas to ``size``.
+        """
+        self.color = color
+        width, height = size or (GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT)
+        self.size = width, height
+        self.surface = pygame.Surface((width * len(PIECE_NAMES),
+                                       height * len(Atlas.VIEWS)))
+        # Look-up table of the rectangle of each view of each rank.
+        self.rects = {}
+        for column, name in enumerate(PIECE_NAMES):
+            if source:
+                images = {view: pygame.transform.smoothscale(
+                              source.image(view, name), self.size)
+                          for view in Atlas.VIEWS}
+            else:
+                images = {
+                    Atlas.LIGHTENED: get_lightened_img(color, name),
+                    Atlas.NORMAL: get_gamepiece_img(color, name),
+                    Atlas.MIRRORED: get_mirrored_img(color, name),
+                }
+            for view in Atlas.VIEWS:
+                rect = pygame.Rect(column * width, view * height,
+                                   width, height)
+                if view == Atlas.BACK_VIEW:
+                    # The back of a piece is just a rectangle in its color.
+                    self.surface.fill(color, rect)
+                else:
+                    self.surface.blit(images[view], rect)
+                self.rects[(view, name)] = rect
+        self.surface = prepare_surface(self.surface)
+
+    def rect(self, /, view, name):
+        """
+        Return the rectangle of the atlas holding the given view of the
+        gamepiece with the given rank name.
+        """
+        try:
+            return self.rects[(view, name)]
+        except KeyError:
+            raise ValueError("Atlas.rect() expected view of 0, 1, 2, or 3 "
+                             "for lightened, normal, backside, or mirrored "
+                             f"and a rank name, got {view!r} and {name!r}"
+                             ) from None
+
+    def image(self, /, view, name):
+        """
+        Return the given view of the gamepiece with the given rank name, as
+        a ``pygame.Surface`` object sharing its pixels with the atlas.
+        """
+        return self.surface.subsurface(self.rect(view, name))
+
+    @staticmethod
+    def get(color, /):
+        """Return the atlas of the given color, building it if necessary."""
+        if color not in Atlas.atlases:
+            Atlas.atlases[color] = Atlas(color)
+        return Atlas.atlases[color]
+
+    @staticmethod
+    def get_scaled(color, size, /):
+        """
+        Return the atlas of the given color with every piece scaled to
+        ``size``, a (width, height) tuple.
+
+        The scaled atlas is built once and then reused until it is asked
+        for in a different size, so nothing is ever scaled while drawing
+        a frame.
+        """
+        size = tuple(size)
+        if size == (GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT):
+            return Atlas.get(color)
+        atlas = Atlas.scaled.get(color)
+        if atlas is None or atlas.size != size:
+            atlas = Atlas(color, Atlas.get(color), size)
+            Atlas.scaled[color] = atlas
+        return atlas
+
+
+# The ``Future`` of the assets being loaded in the background, if any.
+_loading = None
+# Whether ``finalize_assets()`` has been called since the display was
+# created.
+_finalized = False
+
+
+def load_assets():
+    """
+    Decode every gamepiece image, lightened image and mirrored image, and
+    return them (see ``stratego.images.decode_images()``).
+
+    This only decodes and slices: it does not touch the display or any of
+    the registries, so it can run in the background (see
+    ``start_loading()``). finalize_assets() does the rest on the main
+    thread.
+    """
+    return decode_images()
+
+
+def start_loading():
+    """
+    Start decoding all the assets in a background thread.
+
+    Call this as early as possible; the game can then show its first
+    screens while the assets load. Converting them to the pixel format of
+    the display and building the atlases is left to the main thread,
+    since that cannot safely happen while the display is being created or
+    drawn onto. ``wait_for_assets()`` will wait for the
+    loading to be done, if it is not done already.
+    """
+    global _loading
+    executor = ThreadPoolExecutor(max_workers=1,
+                                  thread_name_prefix="stratego-assets")
+    _loading = executor.submit(load_assets)
+    # Let the thread finish on its own; nothing else will be submitted.
+    executor.shutdown(wait=False)
+
+
+def wait_for_assets():
+    """
+    Make sure all the assets are loaded and in the pixel format of the
+    display, waiting for ``start_loading()`` to finish if necessary.
+
+    This is cheap to call again once everything is ready.
+    """
+    if not _finalized:
+        finalize_assets()
+
+
+def finalize_assets():
+    """
+    Load every gamepiece image and atlas, and make sure they are all in the
+    pixel format of the display.
+
+    Call this once the display has been created (``wait_for_assets()``
+    does so if necessary). Surfaces that are not in the display's pixel
+    format have to be converted pixel by pixel every time they are
+    blitted, which is much slower. If ``start_loading()`` was called, this
+    waits for it to finish first and uses what it decoded, and any error
+    it ran into is raised here.
+    """
+    global _loading, _finalized
+    decoded = None
+    if _loading is not None:
+        future, _loading = _loading, None
+        decoded = future.result()
+    finalize_images(decoded)
+    # Any atlas built before the display existed is in the wrong format,
+    # so build them all again.
+    Atlas.atlases = {}
+    Atlas.scaled = {}
+    for color in SHEET_FILENAMES:
+        Atlas.get(color)
+    _finalized = True
@@ -3,12 +3,10 @@
 # So, it will only be actually imported from here, ``stratego.backend``,
 # and then any other module that uses it can import it from here.
 import pygame
-import datetime
-import os
+import collections
 import sys
 pygame.init()
 
-SESSION_ID = str(int(len(os.listdir('.')) / 24))
 GAMEPIECE_WIDTH = 50
 GAMEPIECE_HEIGHT = 70
 EVENTS = (pygame.WINDOWENTER, pygame.WINDOWEXPOSED, pygame.WINDOWFOCUSGAINED,
@@ -48,6 +46,86 @@ def center_text(text_obj, surface, *, x=None, y=None):
     surface.blit(text_obj, rect)
 
 
+# Fonts that have already been loaded, by face and size; see get_font().
+_fonts = {}
+# How many times a font has actually been loaded (rather than found in
+# ``_fonts``). Once every screen has been shown once, this stops growing.
+font_loads = 0
+
+
+def get_font(face, size, /):
+    """
+    Return a ``pygame.font.Font`` for the system font ``face`` in the given
+    size.
+
+    Looking up a system font and opening its file is slow, so each font is
+    only loaded the first time it is asked for, and the same
+    ``pygame.font.Font`` object is returned after that.
+    """
+    global font_loads
+    key = (face, int(size))
+    try:
+        return _fonts[key]
+    except KeyError:
+        font = _fonts[key] = pygame.font.SysFont(*key)
+        font_loads += 1
+        return font
+
+
+# Rendered text, by font, text, antialiasing and color, with the most
+# recently used last; see render_text().
+TEXT_CACHE_SIZE = 256
+_text_cache = collections.OrderedDict()
+text_cache_hits = 0
+text_cache_misses = 0
+
+
+def prepare_surface(surface, /):
+    """
+    Return a copy of ``surface`` converted to the pixel format of the
+    display, so that blitting it does not need to convert every pixel
+    each time.
+
+    Surfaces with per-pixel transparency (such as antialiased text) keep
+    it. If the display has not been created yet, ``surface`` itself is
+    returned unchanged.
+    """
+    if not pygame.display.get_surface():
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def render_text(font, text, antialias, color, /):
+    """
+    Render ``text`` with ``font``, just like ``font.render()``, and return
+    the result converted to the pixel format of the display.
+
+    The same text is drawn over and over (player names, button labels,
+    "STRIKE!"), so the last ``TEXT_CACHE_SIZE`` rendered texts are kept,
+    and rendering one of them again returns the same surface. Surfaces
+    returned by render_text() must therefore not be drawn on.
+    """
+    global text_cache_hits, text_cache_misses
+    key = (font, text, antialias, tuple(color))
+    try:
+        surface = _text_cache[key]
+    except KeyError:
+        text_cache_misses += 1
+        surface = prepare_surface(font.render(text, antialias, color))
+        # Text rendered before the display exists cannot be converted to
+        # its pixel format yet, so it is not worth keeping.
+        if pygame.display.get_surface():
+            _text_cache[key] = surface
+            if len(_text_cache) > TEXT_CACHE_SIZE:
+                _text_cache.popitem(last=False)
+    else:
+        text_cache_hits += 1
+        _text_cache.move_to_end(key)
+    return surface
+
+
 def concat_surfaces(surface1, surface2, /):
     height1 = surface1.get_height()
     height2 = surface2.get_height()
@@ -59,26 +137,9 @@ def concat_surfaces(surface1, surface2, /):
     newsurf = pygame.Surface((width1 + width2, height1), pygame.SRCALPHA)
     newsurf.blit(surface1, (0,0))
     newsurf.blit(surface2, (width1, 0))
-    return newsurf
-
-
-def wait(milliseconds, /):
-    milliseconds = int(milliseconds)
-    timedelta = datetime.timedelta(milliseconds=milliseconds)
-    start_time = datetime.datetime.now()
-
-    while True:
-        pygame.event.get()
-        if datetime.datetime.now() - start_time >= timedelta:
-            return
-        pygame.time.wait(1)
+    return prepare_surface(newsurf)
 
 
 def exit_game():
-    # We need to get rid of any files we may have created!
-    for filename in os.listdir('.'):
-        if filename.startswith(f"{SESSION_ID}-"):
-            os.remove(filename)
-    # Now exit:
     pygame.quit()
     raise SystemExit(0)
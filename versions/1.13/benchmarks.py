@@ -0,0 +1,395 @@
+"""
+Benchmarks for ``stratego``.
+
+Run them with ``python -m stratego.benchmarks``. They open a small window,
+draw into it for a few seconds and print the results.
+"""
+import os
+images_dir = __file__.replace("benchmarks.py", "images")
+os.chdir(images_dir)
+del images_dir
+
+import random
+import time
+
+from stratego.players import Player, pygame
+from stratego.colors import Colors
+from stratego.boards import Board
+from stratego.gamepieces import Gamepiece
+from stratego.atlas import finalize_assets
+from stratego import backend
+from stratego import images, transforms
+from stratego import engine
+from stratego.engine import bitboards, moves
+
+
+def set_up_game(display, /):
+    """
+    Return two players with all their pieces set up on the board, as if
+    both players had just finished ``Player.setup()``.
+    """
+    Player.reset()
+    board = Board(display)
+    players = Player(display, board), Player(display, board)
+    for player in players:
+        player.playername = f"Player {player.id}"
+        squares = board.get_starting_squares(player.boardsection)
+        for piece, square in zip(player.pieces, squares):
+            coords = square.get_coords()
+            board.game.place(piece.piece, coords[2:])
+            piece.x_pos, piece.y_pos = coords[:2]
+            piece.initialx, piece.initialy = piece.x_pos, piece.y_pos
+    return players
+
+
+def set_up_state(rng, /):
+    """
+    Return a ``stratego.engine.GameState`` with both sides' pieces set up
+    at random, the first side on rows 7 to 10 and the second on rows 1 to
+    4, without any graphics.
+    """
+    game = engine.GameState()
+    for rows in (range(7, 11), range(1, 5)):
+        side = game.add_side()
+        squares = [(x, y) for y in rows for x in range(1, 11)]
+        rng.shuffle(squares)
+        for piece, coords in zip(side.pieces, squares):
+            game.place(piece, coords)
+    return game
+
+
+def random_playout(game, rng, /, max_moves=1000):
+    """
+    Play random legal moves for both sides until the game is over or
+    ``max_moves`` moves have been made, and return the number of moves.
+    """
+    for count in range(max_moves):
+        if game.is_over:
+            return count
+        choices = [(piece, coords) for piece in game.turn.active_pieces()
+                   for coords in game.get_open_squares(piece)]
+        game.apply_move(*rng.choice(choices))
+    return max_moves
+
+
+def scan_moves(side, /):
+    """
+    Return every move ``side`` can make, as ``((x, y), (x, y))`` pairs of
+    coordinates, the way ``Gamepiece.get_squares()`` and
+    ``Gamepiece.get_scout_squares()`` found them before
+    ``stratego.engine`` existed: one square at a time, looking for a piece
+    on each square by going through the lists of pieces of both sides.
+
+    This is the reference the bitboards are checked and timed against.
+    """
+    opponent = side.game.opponent(side)
+
+    def is_occupied(player, coords):
+        for piece in player.active_pieces():
+            if (piece.x, piece.y) == coords:
+                return True
+        return False
+
+    moves = []
+    last_two_moves = side.last_two_moves
+    for piece in side.active_pieces():
+        start = piece.x, piece.y
+        if piece.name in ("Bomb", "Flag"):
+            continue
+        forbidden_square = None
+        if all(last_two_moves):
+            if (last_two_moves[0][0] == last_two_moves[1][1] == start
+                    and last_two_moves[0][1] == last_two_moves[1][0]):
+                forbidden_square = last_two_moves[0][1]
+        x, y = start
+        if piece.name == "Scout":
+            rows = ([(x, y) for x in range(piece.x - 1, 0, -1)],
+                    [(x, y) for x in range(piece.x + 1, 11)],
+                    [(x, y) for y in range(piece.y - 1, 0, -1)],
+                    [(x, y) for y in range(piece.y + 1, 11)])
+            for row in rows:
+                blocked = False
+                for coords in row:
+                    if is_occupied(side, coords) or coords in engine.LAKES:
+                        blocked = True
+                    if not blocked and coords != forbidden_square:
+                        moves.append((start, coords))
+                    if is_occupied(opponent, coords):
+                        blocked = True
+        else:
+            neighbours = []
+            if x != 1:
+                neighbours.append((x - 1, y))
+            if x != 10:
+                neighbours.append((x + 1, y))
+            if y != 1:
+                neighbours.append((x, y - 1))
+            if y != 10:
+                neighbours.append((x, y + 1))
+            for coords in neighbours:
+                if (not is_occupied(side, coords)
+                        and coords not in engine.LAKES
+                        and coords != forbidden_square):
+                    moves.append((start, coords))
+    return moves
+
+
+def count_scanned_moves(side, /):
+    """Return how many moves ``side`` can make, with scan_moves()."""
+    return len(scan_moves(side))
+
+
+def time_per_side(function, sides, rounds, /):
+    """Return the average time, in seconds, of ``function(side)``."""
+    start = time.perf_counter()
+    for round in range(rounds):
+        for side in sides:
+            function(side)
+    return (time.perf_counter() - start) / rounds / len(sides)
+
+
+def benchmark_bitboards(positions=200, rounds=20, /):
+    """
+    Check that ``stratego.engine.bitboards`` finds the same moves as the
+    old square-by-square search (see scan_moves()) in random positions,
+    and compare how long the two take to list the moves and to count
+    them.
+    """
+    rng = random.Random(1)
+    sides = []
+    for position in range(positions):
+        game = set_up_state(rng)
+        random_playout(game, rng, rng.randrange(400))
+        sides.extend(game.sides)
+    for side in sides:
+        moves = [engine.square_index(start)
+                 | engine.square_index(end) << bitboards.END_SHIFT
+                 for start, end in scan_moves(side)]
+        if (sorted(bitboards.get_moves(side)) != sorted(moves)
+                or bitboards.count_moves(side) != len(moves)):
+            raise RuntimeError("Bitboard moves differ from scan_moves()")
+    print(f"Same moves in {len(sides)} random positions")
+    for label, scan, bitboard in (
+            ("Listing", scan_moves, bitboards.get_moves),
+            ("Counting", count_scanned_moves, bitboards.count_moves)):
+        scan = time_per_side(scan, sides, rounds)
+        bitboard = time_per_side(bitboard, sides, rounds)
+        print(f"{label} moves, square by square: "
+              f"{scan * 1e6:.1f} us per position")
+        print(f"{label} moves, bitboards:        "
+              f"{bitboard * 1e6:.1f} us per position "
+              f"({scan / bitboard:.1f}x faster)")
+
+
+def get_snapshot(game, /):
+    """
+    Return everything about ``game`` that making and taking back a move
+    could change, in a form that can be compared.
+    """
+    return ([(piece.state, piece.x, piece.y)
+             for side in game.sides for piece in side.pieces],
+            [piece and (piece.side.index, piece.index)
+             for piece in game.occupants],
+            [(side.occupied, side.bitboards, side.last_two_moves)
+             for side in game.sides],
+            game.winner and game.winner.index, game.turn.index)
+
+
+def count_nodes(game, depth, /):
+    """
+    Make and take back every sequence of ``depth`` moves from the current
+    position, and return how many positions were reached.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in moves.generate_moves(game):
+        moves.make_move(game, move)
+        nodes += count_nodes(game, depth - 1)
+        moves.unmake_move(game, move)
+    return nodes
+
+
+def benchmark_make_unmake(positions=20, depth=2, /):
+    """
+    Walk the tree of moves ``depth`` moves deep from random positions with
+    ``stratego.engine.moves``, checking that every position is exactly the
+    same once all its moves have been taken back.
+    """
+    rng = random.Random(2)
+    games = []
+    for position in range(positions):
+        game = set_up_state(rng)
+        random_playout(game, rng, rng.randrange(400))
+        games.append(game)
+    nodes = 0
+    start = time.perf_counter()
+    for game in games:
+        snapshot = get_snapshot(game)
+        nodes += count_nodes(game, depth)
+        if get_snapshot(game) != snapshot:
+            raise RuntimeError("unmake_move() did not restore the game")
+    elapsed = time.perf_counter() - start
+    print(f"Make/unmake search, {depth} moves deep: {nodes} positions, "
+          f"{nodes / elapsed:.0f} per second")
+
+
+def benchmark_playouts(games=20, /):
+    """
+    Time random games played on ``stratego.engine`` alone, with no display
+    at all.
+    """
+    rng = random.Random(0)
+    moves = 0
+    start = time.perf_counter()
+    for game in range(games):
+        moves += random_playout(set_up_state(rng), rng)
+    elapsed = time.perf_counter() - start
+    print(f"Headless random playouts: {moves} moves in {games} games, "
+          f"{moves / elapsed:.0f} moves per second")
+
+
+def time_move_frames(players, frames, /):
+    """
+    Return the average time, in seconds, spent blitting gamepieces in one
+    frame of the ``Gamepiece.move()`` animation.
+    """
+    player1, player2 = players
+    total = 0
+    for frame in range(frames):
+        player1.board.render()
+        start = time.perf_counter()
+        player2.render_pieces(view=Gamepiece.BACK_VIEW)
+        player1.render_pieces()
+        total += time.perf_counter() - start
+    return total / frames
+
+
+def benchmark_move_blits(display, /, frames=300):
+    """
+    Compare drawing ``Gamepiece.move()`` frames with gamepiece images in
+    the pixel format they were loaded in and in the display's own format
+    (see ``stratego.atlas.finalize_assets()``).
+    """
+    finalize_assets()
+    players = set_up_game(display)
+    # These are the atlases that are actually drawn from, scaled to the
+    # size of the board.
+    atlases = [player.pieces[0].atlas for player in players]
+    converted = [atlas.surface for atlas in atlases]
+    for atlas in atlases:
+        # Before prepare_surface(), the sprites were the 24-bit RGB
+        # surfaces decoded from the JPEG sprite sheets, which have no
+        # alpha but still have to be converted to the display's pixel
+        # format on every blit.
+        unconverted = pygame.Surface(atlas.surface.get_size(), 0, 24)
+        unconverted.blit(atlas.surface, (0, 0))
+        atlas.surface = unconverted
+    before = time_move_frames(players, frames)
+    for atlas, surface in zip(atlases, converted):
+        atlas.surface = surface
+    after = time_move_frames(players, frames)
+    print("Gamepiece blits per move frame, unconverted sprites: "
+          f"{before * 1000:.3f} ms")
+    print("Gamepiece blits per move frame, converted sprites:   "
+          f"{after * 1000:.3f} ms ({before / after:.2f}x faster)")
+
+
+def benchmark_variants(rounds=200, /):
+    """
+    Compare making the lightened and mirrored images of every gamepiece
+    of both colors with ``stratego.transforms.make_variants()`` and one
+    image at a time with ``PIL`` and ``pygame.transform``.
+    """
+    if not transforms.AVAILABLE:
+        print("NumPy is not installed; skipping the variants benchmark")
+        return
+    colors = (Colors.PLAYER_RED, Colors.PLAYER_BLUE)
+    sheets = [images.get_sheet(color) for color in colors]
+    pieces = [img for sheet in sheets for img in images.slice_sheet(sheet)]
+
+    def one_at_a_time():
+        for img in pieces:
+            images.lighten_image(img)
+            images.flip_img(img)
+
+    def whole_sheets():
+        transforms.make_variants(sheets, images.GAMEPIECE_WIDTH,
+                                 images.LIGHTENING_FACTOR)
+
+    timings = []
+    for function in (one_at_a_time, whole_sheets):
+        start = time.perf_counter()
+        for round in range(rounds):
+            function()
+        timings.append((time.perf_counter() - start) / rounds)
+    before, after = timings
+    print("Lightened and mirrored images, one at a time: "
+          f"{before * 1000:.3f} ms")
+    print("Lightened and mirrored images, whole sheets:  "
+          f"{after * 1000:.3f} ms ({before / after:.1f}x faster)")
+
+
+def draw_text(players, /):
+    """Draw the text that is shown over and over during a game."""
+    for player in players:
+        player.name(int(player.board.CONSTANT / 13), with_comma=True)
+        for piece in player.pieces:
+            piece.get_name()
+
+
+def benchmark_font_loads(display, /, rounds=100):
+    """
+    Count how many fonts are loaded while drawing the same text again and
+    again, once every font has been loaded for the first time.
+    """
+    players = set_up_game(display)
+    draw_text(players)
+    warm = backend.font_loads
+    start = time.perf_counter()
+    for round in range(rounds):
+        draw_text(players)
+    elapsed = time.perf_counter() - start
+    print(f"Font loads while warming up: {warm}")
+    print(f"Font loads in the next {rounds} rounds of text: "
+          f"{backend.font_loads - warm} ({elapsed / rounds * 1000:.3f} ms "
+          "per round)")
+
+
+def benchmark_text_cache(display, /, rounds=100):
+    """
+    Compare drawing the same text again and again with and without
+    ``stratego.backend.render_text()``'s cache.
+    """
+    players = set_up_game(display)
+    start = time.perf_counter()
+    for round in range(rounds):
+        backend._text_cache.clear()
+        draw_text(players)
+    uncached = (time.perf_counter() - start) / rounds
+    hits, misses = backend.text_cache_hits, backend.text_cache_misses
+    start = time.perf_counter()
+    for round in range(rounds):
+        draw_text(players)
+    cached = (time.perf_counter() - start) / rounds
+    hits = backend.text_cache_hits - hits
+    misses = backend.text_cache_misses - misses
+    print(f"Text per round, uncached: {uncached * 1000:.3f} ms")
+    print(f"Text per round, cached:   {cached * 1000:.3f} ms "
+          f"({uncached / cached:.1f}x faster; {hits} hits, {misses} misses)")
+
+
+def main():
+    display = pygame.display.set_mode((1280, 900))
+    benchmark_move_blits(display)
+    benchmark_font_loads(display)
+    benchmark_text_cache(display)
+    benchmark_variants()
+    pygame.quit()
+    benchmark_playouts()
+    benchmark_bitboards()
+    benchmark_make_unmake()
+
+
+if __name__ == "__main__":
+    main()
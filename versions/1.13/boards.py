@@ -1,6 +1,26 @@
 from stratego.colors import Colors, pygame
+from stratego.backend import prepare_surface, GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT
+from stratego.engine import GameState, LAKES
 
+# The size the squares were designed at. The actual size depends on the
+# display (see ``get_square_size()``), and everything else on the board is
+# scaled along with it.
 SQUARE_SIZE = 80
+# How much room to leave, at least, on the left and right of the board for
+# text and buttons, and above and below it.
+MIN_SIDE_WIDTH = 250
+MIN_MARGIN = 20
+
+
+def get_square_size(display, /) -> int:
+    """
+    Return the size of the squares for the given display: the largest size
+    at which the whole board, with the room it needs around it, still fits
+    onto the display.
+    """
+    by_height = (display.get_height() - MIN_MARGIN*2 - 18) // 10
+    by_width = (display.get_width() - MIN_SIDE_WIDTH*2 - 18) // 10
+    return max(min(by_height, by_width), 10)
 
 
 class Square:
@@ -9,11 +29,12 @@ class Square:
     STRIKE = Colors.RED
     SELECTED = Colors.LIGHT_BLUE
 
-    def __init__(self, /, display):
+    def __init__(self, /, display, size=SQUARE_SIZE):
         if not isinstance(display, pygame.surface.Surface):
             msg = f"Expected pygame.surface.Surface object, got {display!r}"
             raise ValueError(msg)
         self.display = display
+        self.size = size
         self.display_width = display.get_width()
         self.display_height = display.get_height()
         self.gridx = Square.x
@@ -25,23 +46,31 @@ class Square:
         if Square.x == 11:
             Square.y += 1
             Square.x = 1
-        self.x = self.display_width/2 + (SQUARE_SIZE + 2)*(self.gridx - 6) + 1
-        self.y = self.display_height/2 + (SQUARE_SIZE + 2)*(self.gridy - 6) + 1
-
-    def render(self, /, mode=NORMAL):
+        self.x = self.display_width/2 + (size + 2)*(self.gridx - 6) + 1
+        self.y = self.display_height/2 + (size + 2)*(self.gridy - 6) + 1
+
+    def render(self, /, mode=NORMAL, surface=None):
+        """
+        Draw the square in the given mode (or as selected, if it is) onto
+        ``surface``, or onto ``self.display`` if no surface is given.
+        """
         if mode not in (Square.NORMAL, Square.ACTIVE, Square.STRIKE):
             raise ValueError("Square.render() expected Square.NORMAL, Square."
                              f"ACTIVE, or Square.STRIKE, got {mode!r}")
 
         if self.selected: mode = Square.SELECTED
         self.state = mode
-        pygame.draw.rect(self.display, mode,
-                         (self.x, self.y, SQUARE_SIZE, SQUARE_SIZE))
-
-    def hovered(self, /):
-        mouse = pygame.mouse.get_pos()
-        return (self.x + SQUARE_SIZE > mouse[0] > self.x
-                and self.y + SQUARE_SIZE > mouse[1] > self.y)
+        (surface or self.display).fill(mode, (self.x, self.y, self.size,
+                                              self.size))
+
+    def hovered(self, /, pos=None):
+        """
+        Return True if ``pos`` (by default, the mouse's position) is on the
+        square.
+        """
+        mouse = pos or pygame.mouse.get_pos()
+        return (self.x + self.size > mouse[0] > self.x
+                and self.y + self.size > mouse[1] > self.y)
 
     def get_coords(self, /) -> tuple:
         return self.x, self.y, self.gridx, self.gridy
@@ -62,31 +91,87 @@ class Board:
     def __init__(self, /, display):
         self.display = display
         self.squares = []
+        # The rules of the game being played on this board, and where
+        # every piece is (see ``stratego.engine``).
+        self.game = GameState()
+        # Scale the board to the display, and the gamepieces along with it.
+        self.square_size = size = get_square_size(display)
+        self.piece_size = (round(GAMEPIECE_WIDTH * size / SQUARE_SIZE),
+                           round(GAMEPIECE_HEIGHT * size / SQUARE_SIZE))
         self.centerx = self.display.get_width() / 2
         self.centery = self.display.get_height() / 2
-        self.x = self.centerx - (SQUARE_SIZE*5 + 9)
-        self.y = self.centery - (SQUARE_SIZE*5 + 9)
-        self.totalsize = SQUARE_SIZE * 10 + 18
+        self.x = self.centerx - (size*5 + 9)
+        self.y = self.centery - (size*5 + 9)
+        self.totalsize = size * 10 + 18
         self.CONSTANT = (self.display.get_width() - self.totalsize) / 2
         for counter in range(100):
-            new = Square(display)
-            if new.gridy in (5, 6) and new.gridx in (3, 4, 7, 8):
+            new = Square(display, size)
+            if (new.gridx, new.gridy) in LAKES:
                 new.lake = True
-            new.render()
             self.squares.append(new)
-
-    def render(self, /):
-        pygame.draw.rect(self.display, Colors.BLACK,
-                         (self.x, self.y, self.totalsize, self.totalsize))
+        # Everything that never changes is drawn once, onto this surface.
+        self.surface = self.render_static()
+
+    def render_static(self, /):
+        """
+        Return a new ``pygame.Surface`` object with the board drawn onto it
+        as it looks with no squares highlighted: the black grid lines, the
+        squares and the two lakes.
+        """
+        surface = pygame.Surface((self.totalsize, self.totalsize))
+        surface.fill(Colors.BLACK)
+        size = self.square_size
         for square in self.squares:
-            square.render()
+            pygame.draw.rect(surface, Square.NORMAL,
+                             (square.x - self.x, square.y - self.y,
+                              size, size))
         # Draw two lakes
-        pygame.draw.circle(self.display, Colors.DARK_BLUE,
-                           (self.centerx - (SQUARE_SIZE*2 + 4),
-                            self.centery), SQUARE_SIZE + 1)
-        pygame.draw.circle(self.display, Colors.DARK_BLUE,
-                           (self.centerx + SQUARE_SIZE*2 + 4,
-                            self.centery), SQUARE_SIZE + 1)
+        centerx = self.centerx - self.x
+        centery = self.centery - self.y
+        pygame.draw.circle(surface, Colors.DARK_BLUE,
+                           (centerx - (size*2 + 4), centery), size + 1)
+        pygame.draw.circle(surface, Colors.DARK_BLUE,
+                           (centerx + size*2 + 4, centery), size + 1)
+        return prepare_surface(surface)
+
+    def get_rect(self, /):
+        """Return the area of the display that the board is drawn onto."""
+        return pygame.Rect(self.x, self.y, self.totalsize, self.totalsize)
+
+    def get_side_rect(self, /):
+        """
+        Return the area of the display to the left of the board, where
+        each screen writes its text.
+        """
+        return pygame.Rect(0, 0, self.x, self.display.get_height())
+
+    def render(self, /, surface=None):
+        """
+        Draw the board, with no squares highlighted except the selected
+        ones, onto ``surface``, or onto ``self.display`` if no surface is
+        given.
+
+        The board itself is a single blit of ``self.surface``; only the
+        selected squares are drawn on top of it.
+        """
+        self.render_base(surface)
+        self.render_selected(surface)
+
+    def render_base(self, /, surface=None):
+        """
+        Draw the board with no squares highlighted at all, and set every
+        square that is not selected back to ``Square.NORMAL``.
+        """
+        (surface or self.display).blit(self.surface, (self.x, self.y))
+        for square in self.squares:
+            if not square.selected:
+                square.state = Square.NORMAL
+
+    def render_selected(self, /, surface=None):
+        """Draw only the selected squares."""
+        for square in self.squares:
+            if square.selected:
+                square.render(surface=surface)
 
     def setsquare(self, /, squarex, squarey, mode):
         if mode not in (Square.NORMAL, Square.ACTIVE, Square.STRIKE):
@@ -107,6 +192,37 @@ class Board:
         square_index = (squarey - 1) * 10 + squarex - 1
         return self.squares[square_index]
 
+    def grid_pos(self, /, pos):
+        """
+        Return the grid coordinates, ``(gridx, gridy)``, of the square at
+        the point ``pos`` on the display, or None if ``pos`` is not on a
+        square (it is off the board, or on the lines between squares).
+
+        The squares are laid out evenly, so this is worked out directly
+        rather than by asking every square whether it is hovered over; it
+        gives the same answer as ``Square.hovered()``.
+        """
+        step = self.square_size + 2
+        # The left and top edges of the top left square.
+        left = self.centerx - step*5 + 1
+        top = self.centery - step*5 + 1
+        column, x = divmod(pos[0] - left, step)
+        row, y = divmod(pos[1] - top, step)
+        if (0 <= column < 10 and 0 <= row < 10
+                and 0 < x < self.square_size and 0 < y < self.square_size):
+            return int(column) + 1, int(row) + 1
+        return None
+
+    def square_at(self, /, pos):
+        """
+        Return the square at the point ``pos`` on the display, or None if
+        there is none; see ``Board.grid_pos()``.
+        """
+        coords = self.grid_pos(pos)
+        if coords:
+            return self.get_square(*coords)
+        return None
+
     def get_starting_squares(self, /, section):
         if section not in (Board.FRONT, Board.BACK):
             raise ValueError("Board.get_starting_squares() expected either "
@@ -1,5 +1,11 @@
 from stratego.colors import pygame, Colors
-from stratego.backend import DEFAULT_FONT
+from stratego.backend import (
+    render_text,
+    get_font,
+    prepare_surface,
+    DEFAULT_FONT
+)
+from stratego.scheduler import mark_dirty
 
 
 class Button:
@@ -58,18 +64,22 @@ class Button:
 
     How to use the ``Button`` class
     -------------------------------
-    1. Delete all buttons that have been created:
-    >>> Button.clear_all_buttons()
-    2. Create your buttons:
-    >>> Button(*buttonargs1)
-    >>> Button(*buttonargs2)
+    1. Create your buttons once, before the screen is first drawn:
+    >>> button1 = Button(*buttonargs1)
+    >>> button2 = Button(*buttonargs2)
+    Each button draws itself in its normal color and in its hover color
+    once, when it is created, so that showing it or switching its color
+    later is a single blit.
+    2. Whenever the screen is drawn, show its buttons. This draws them and
+    makes them the only buttons that respond to the mouse:
+    >>> Button.show_buttons(button1, button2)
     3. Process MOUSEBUTTONUP event in game loop:
     >>> while True:
     ...     for event in pygame.event.get():
     ...         ...
     ...         if event.type == pygame.MOUSEBUTTONUP:
     ... #############################################
-    ...             result = Button.process_click()
+    ...             result = Button.process_click(event.pos)
     ... #############################################
     When this function is called, ``Button`` will check to see if any
     buttons are being hovered over, and if one is (implying that the user
@@ -165,10 +175,27 @@ class Button:
         self.id = Button.id
         Button.id += 1
         font_size = max(int(self.height/2), 10)
-        self.font = pygame.font.SysFont(DEFAULT_FONT, font_size)
+        self.font = get_font(DEFAULT_FONT, font_size)
+        self.prerender()
 
-        self.render(norm_color)
-        Button.buttons.append(self)
+    def make_surface(self, /, color):
+        """
+        Return a surface with the button drawn on it in the supplied color.
+        """
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(color)
+        text_surf = render_text(self.font, self.msg, True, Colors.BLACK)
+        text_rect = text_surf.get_rect()
+        text_rect.center = self.width/2, self.height/2
+        surface.blit(text_surf, text_rect)
+        return prepare_surface(surface)
+
+    def prerender(self, /):
+        """Draw the button in its normal and hover colors, for later."""
+        self.surfaces = {
+            self.norm_color: self.make_surface(self.norm_color),
+            self.hover_color: self.make_surface(self.hover_color)
+        }
 
     def render(self, color, /):
         """
@@ -179,12 +206,12 @@ class Button:
         color: parameter-only, tuple
             An RGB color in tuple form.
         """
-        pygame.draw.rect(self.display, color,
-                         (self.x, self.y, self.width, self.height))
-        text_surf = self.font.render(self.msg, True, Colors.BLACK)
-        text_rect = text_surf.get_rect()
-        text_rect.center = self.x + (self.width/2), self.y + (self.height/2)
-        self.display.blit(text_surf, text_rect)
+        try:
+            surface = self.surfaces[color]
+        except KeyError:
+            surface = self.make_surface(color)
+        self.display.blit(surface, (self.x, self.y))
+        mark_dirty()
 
     def switch(self, /):
         """
@@ -203,17 +230,21 @@ class Button:
         Change the text on the button.
         """
         self.msg = new_msg
+        self.prerender()
         if self.hovered():
             self.render(self.hover_color)
         else:
             self.render(self.norm_color)
 
-    def hovered(self, /):
+    def hovered(self, /, pos=None):
         """
         Return True if the button is being hovered over, otherwise
         return False.
+
+        If ``pos`` is given, it is used as the mouse's position instead of
+        asking pygame for it.
         """
-        mouse = pygame.mouse.get_pos()
+        mouse = pos or pygame.mouse.get_pos()
         return (self.x + self.width > mouse[0] - self.x_deficit > self.x
                 and self.y + self.height > mouse[1] - self.y_deficit > self.y)
 
@@ -221,24 +252,24 @@ class Button:
         """Delete the button from the system."""
         pygame.draw.rect(self.display, Colors.WHITE,
                          (self.x, self.y, self.width, self.height))
-        for i in range(len(Button.buttons)):
-            if Button.buttons[i].id == self.id:
-                Button.buttons.pop(i)
+        Button.buttons = [button for button in Button.buttons
+                          if button.id != self.id]
 
     def __call__(self, /):
         """Call the button's function, with the supplied arguments."""
         return self.func(*self.args, **self.kwargs)
 
     @staticmethod
-    def listen():
+    def listen(pos=None):
         """
         See if any buttons are being hovered over, or if any buttons
         that were being hovered over are now not, and act accordingly.
 
         This function will not update the display in any way.
         """
+        mouse = pos or pygame.mouse.get_pos()
         for button in Button.buttons:
-            if button.hovered():
+            if button.hovered(mouse):
                 if not button.active:
                     button.switch()
                     # Turn the cursor into the little "hand":
@@ -251,25 +282,37 @@ class Button:
                 button.switch()
 
     @staticmethod
-    def process_click():
+    def process_click(pos=None):
         """
         Call the function of whatever Button instance is being hovered.
 
         Only call this function if there was a MOUSEBUTTONUP event. When
         it is called, this function will assume that the mouse was
         clicked. If no buttons are being hovered over, it will do
-        nothing.
+        nothing. ``pos`` can be the position of the click (the event's
+        ``pos`` attribute); by default it is the mouse's position.
         """
+        mouse = pos or pygame.mouse.get_pos()
         for button in Button.buttons:
-            if button.hovered():
+            if button.hovered(mouse):
                 # The button was clicked, so set the cursor back to the
                 # normal arrow. (The button will probably subsequently be
                 # destroyed.)
                 pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
                 return button()
 
+    @staticmethod
+    def show_buttons(*buttons):
+        """
+        Draw the given buttons in their normal colors, and make them the
+        only buttons that respond to the mouse.
+        """
+        Button.buttons = list(buttons)
+        for button in buttons:
+            button.active = False
+            button.render(button.norm_color)
+
     @staticmethod
     def clear_all_buttons():
         """Destroy all buttons that were created."""
         Button.buttons = []
-        Button.id = 0
@@ -0,0 +1,197 @@
+from stratego.colors import Colors, pygame
+from stratego.backend import prepare_surface
+from stratego.scheduler import mark_dirty
+
+
+def fill_white(surface, /):
+    """Draw function for a plain white background layer."""
+    surface.fill(Colors.WHITE)
+
+
+class Layer:
+    """
+    One layer of a ``Compositor``: a surface covering the area of the
+    display the layer draws onto, and the function that draws it.
+
+    Parameters
+    ----------
+    draw:
+        Callable that takes the layer and draws its contents onto it,
+        using the same coordinates as the display. The layer has the
+        blit() and fill() methods of ``pygame.Surface``, which is all the
+        draw functions need.
+    rect:
+        The area of the display the layer covers. Anything drawn outside
+        of it is clipped.
+    opaque=False:
+        Whether the layer covers all of ``rect``. Opaque layers are not
+        cleared before they are drawn, and do not need per-pixel alpha.
+
+    Each draw call returns the area it changed, so the layer keeps track
+    of the part of it that has anything drawn on it without ever looking
+    at its pixels.
+    """
+    def __init__(self, /, draw, rect, opaque=False):
+        self.draw = draw
+        self.rect = pygame.Rect(rect)
+        self.opaque = opaque
+        flags = 0 if opaque else pygame.SRCALPHA
+        self.surface = prepare_surface(pygame.Surface(self.rect.size, flags))
+        self.dirty = True
+        # The part of the display that has anything drawn on it by the
+        # layer.
+        self.bounds = self.rect.copy()
+        self.drawn = []
+
+    def blit(self, /, source, dest, area=None):
+        """
+        Like ``pygame.Surface.blit()``, with ``dest`` in the coordinates of
+        the display.
+        """
+        x, y = self.rect.topleft
+        rect = self.surface.blit(source, (dest[0] - x, dest[1] - y), area)
+        rect.move_ip(x, y)
+        self.drawn.append(rect)
+        return rect
+
+    def fill(self, /, color, rect=None):
+        """
+        Like ``pygame.Surface.fill()``, with ``rect`` in the coordinates of
+        the display.
+        """
+        if rect is not None:
+            rect = pygame.Rect(rect).move(-self.rect.x, -self.rect.y)
+        rect = self.surface.fill(color, rect)
+        rect.move_ip(self.rect.topleft)
+        self.drawn.append(rect)
+        return rect
+
+    def rebuild(self, /):
+        """
+        Draw the layer again, and return the area of the display that may
+        look different because of it.
+        """
+        old_bounds = self.bounds
+        if not self.opaque and old_bounds:
+            # Only the part that was drawn on needs clearing.
+            self.surface.fill((0, 0, 0, 0),
+                              old_bounds.move(-self.rect.x, -self.rect.y))
+        self.drawn = []
+        self.draw(self)
+        self.dirty = False
+        if self.opaque:
+            self.bounds = self.rect.copy()
+        else:
+            drawn = [rect for rect in self.drawn if rect]
+            if drawn:
+                self.bounds = drawn[0].unionall(drawn[1:])
+            else:
+                self.bounds = pygame.Rect(self.rect.topleft, (0, 0))
+        self.drawn = []
+        changed = [rect for rect in (old_bounds, self.bounds) if rect]
+        if not changed:
+            return pygame.Rect(0, 0, 0, 0)
+        return changed[0].unionall(changed[1:])
+
+
+class Compositor:
+    """
+    Draw a screen as a stack of separately cached layers.
+
+    Each layer is only drawn again when it is invalidated, and then only
+    the part of the display it covers is put back together from the
+    cached layers. So, for example, highlighting a few squares redraws
+    the highlight layer and nothing else.
+
+    How to use the ``Compositor`` class
+    -----------------------------------
+    1. Create a compositor for the screen and give it its layers, each
+    covering only the area of the display it draws onto:
+    >>> compositor = Compositor(display)
+    >>> compositor.set_layer(Compositor.BACKGROUND, draw_background)
+    >>> compositor.set_layer(Compositor.BOARD, board.render,
+    ...                      rect=board.get_rect())
+    2. Whenever something on a layer changes, invalidate that layer:
+    >>> compositor.invalidate(Compositor.HIGHLIGHTS)
+    3. Call Compositor.render() to draw the changes onto the display:
+    >>> compositor.render()
+    If something else has drawn over the display (such as the "Do you
+    want to close game?" box), ``Compositor.refresh()`` puts the whole
+    screen back together without drawing any of the layers again.
+
+    A compositor is meant to be made once for each screen and kept: when
+    the screen is shown again, calling set_layer() with new draw functions
+    reuses the surfaces of the layers instead of allocating them again.
+    """
+    BACKGROUND = 0
+    BOARD = 1
+    HIGHLIGHTS = 2
+    PIECES = 3
+    HUD = 4
+
+    def __init__(self, /, display):
+        self.display = display
+        self.layers = {}
+        self.dirty_rects = []
+
+    def set_layer(self, /, level, draw, opaque=False, rect=None):
+        """
+        Add a layer at the given level (one of ``Compositor.BACKGROUND``,
+        ``BOARD``, ``HIGHLIGHTS``, ``PIECES`` or ``HUD``), covering
+        ``rect`` (by default, the whole display), and replacing any layer
+        already there.
+
+        If the layer already there covers the same area, only its draw
+        function is replaced, and it is invalidated.
+        """
+        if rect is None:
+            rect = self.display.get_rect()
+        rect = pygame.Rect(rect)
+        layer = self.layers.get(level)
+        if (layer is not None and layer.rect == rect
+                and layer.opaque == opaque):
+            layer.draw = draw
+            layer.dirty = True
+        else:
+            self.layers[level] = Layer(draw, rect, opaque)
+
+    def invalidate(self, /, *levels):
+        """
+        Mark the layers at the given levels as needing to be drawn again.
+        With no levels given, every layer is invalidated.
+        """
+        for level in levels or self.layers:
+            self.layers[level].dirty = True
+
+    def refresh(self, /):
+        """Put the whole screen back together from the cached layers."""
+        self.dirty_rects.append(self.display.get_rect())
+        return self.render()
+
+    def render(self, /):
+        """
+        Draw every invalidated layer again, and put back together the
+        parts of the display that changed.
+
+        Return the list of rectangles of the display that were changed,
+        which can be passed to ``pygame.display.update()``.
+        """
+        for level in sorted(self.layers):
+            layer = self.layers[level]
+            if layer.dirty:
+                self.dirty_rects.append(layer.rebuild())
+        rects = [rect for rect in self.dirty_rects if rect]
+        self.dirty_rects = []
+        if not rects:
+            return []
+        area = rects[0].unionall(rects[1:])
+        for level in sorted(self.layers):
+            layer = self.layers[level]
+            # Only the part of each layer that has anything on it needs
+            # to be copied.
+            clip = area.clip(layer.bounds)
+            if clip:
+                self.display.blit(layer.surface, clip,
+                                  clip.move(-layer.rect.x, -layer.rect.y))
+        mark_dirty()
+        return [area]
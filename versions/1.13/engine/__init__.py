@@ -0,0 +1,26 @@
+"""
+The rules of Stratego, with no graphics.
+
+``stratego.engine`` knows where every piece is, which moves are legal,
+who wins a strike and when the game is over, and nothing else. It does not
+import ``pygame`` (or any other ``stratego`` module that does), so it can
+be used to play or simulate games without a display; the classes in
+``stratego.players``, ``stratego.gamepieces`` and ``stratego.boards`` only
+show the state kept here.
+
+Squares are given as ``(x, y)`` grid coordinates, from 1 to 10, just like
+``Square.gridx`` and ``Square.gridy``.
+"""
+from stratego.engine.pieces import (
+    Piece,
+    strike,
+    CREATED,
+    ACTIVE,
+    KILLED,
+    RANKS,
+    PIECE_NAMES,
+    IMMOVABLE
+)
+from stratego.engine.geometry import LAKES, square_index, square_coords
+from stratego.engine.state import GameState, Side
+from stratego.engine.moves import generate_moves, make_move, unmake_move
@@ -0,0 +1,158 @@
+"""
+Move generation with bitboards.
+
+A bitboard is an int with one bit for each square of the board, numbered
+like ``GameState.occupants`` (see ``square_index()``): bit 0 is (1, 1),
+bit 9 is (10, 1) and bit 99 is (10, 10). Each ``Side`` keeps a bitboard of
+all its pieces and one for each kind of piece, up to date as pieces move
+and die, so the moves of all its pieces can be found with a few shifts and
+masks instead of looking at one square at a time:
+    - Moving every piece one square to the left is ``bitboard >> 1``, to
+      the right ``bitboard << 1``, up ``bitboard >> 10`` and down
+      ``bitboard << 10`` (masking off the pieces that would fall off the
+      board).
+    - Masking the result with the squares that are neither lakes nor
+      taken by the side's own pieces leaves the squares the pieces can
+      move to.
+
+How to use ``stratego.engine.bitboards``
+----------------------------------------
+>>> from stratego.engine.geometry import square_coords
+>>> for move in get_moves(game.sides[0]):
+...     start, end = move & SQUARE_MASK, move >> END_SHIFT
+...     print(square_coords(start), "->", square_coords(end))
+>>> count_moves(game.sides[1])
+"""
+from stratego.engine.geometry import LAKES, square_index
+
+# Every square of the board.
+FULL = (1 << 100) - 1
+COLUMN_1 = sum(1 << square_index((1, y)) for y in range(1, 11))
+COLUMN_10 = sum(1 << square_index((10, y)) for y in range(1, 11))
+LAKE_MASK = sum(1 << square_index(coords) for coords in LAKES)
+NOT_COLUMN_1 = FULL ^ COLUMN_1
+NOT_COLUMN_10 = FULL ^ COLUMN_10
+# For each direction, in the same order as ``state.DIRECTIONS``: how far
+# the bits move, and the squares a piece can move from in that direction.
+STEPS = ((-1, NOT_COLUMN_1), (1, NOT_COLUMN_10), (-10, FULL), (10, FULL))
+# Moves are ints, with the index of the square they start from in the
+# lowest bits and the index of the square they end on above it, just like
+# in ``stratego.engine.moves``, which adds the rest.
+SQUARE_MASK = 0b1111111
+END_SHIFT = 7
+
+
+def shift(bitboard, step, /):
+    """Move every square of ``bitboard`` by ``step`` squares."""
+    if step > 0:
+        return (bitboard << step) & FULL
+    return bitboard >> -step
+
+
+def get_step_targets(side, /):
+    """
+    Return the squares that the pieces of ``side`` that move one square at
+    a time can move to, as a ``(step, bitboard)`` pair for each direction;
+    the piece that can move to a square ``index`` of ``bitboard`` is on
+    the square ``index - step``.
+    """
+    bitboards = side.bitboards
+    movers = side.occupied & ~(bitboards["Bomb"] | bitboards["Flag"]
+                               | bitboards["Scout"])
+    allowed = FULL & ~side.occupied & ~LAKE_MASK
+    # The four shifts of STEPS, written out.
+    return [(-1, (movers & NOT_COLUMN_1) >> 1 & allowed),
+            (1, (movers & NOT_COLUMN_10) << 1 & allowed),
+            (-10, movers >> 10 & allowed),
+            (10, movers << 10 & allowed)]
+
+
+def get_scout_targets(side, /):
+    """
+    Return the squares the Scouts of ``side`` can move to, as a ``(step,
+    distance, bitboard)`` triple for each direction and distance; the
+    Scout that can move to a square ``index`` of ``bitboard`` is on the
+    square ``index - step*distance``.
+
+    All the Scouts are moved together, one square at a time, until every
+    one of them has run into the edge of the board, a lake, a piece of its
+    own side, or (after moving onto its square) an enemy piece. Since a
+    Scout stops before its own side's pieces, two Scouts can never be
+    moved onto the same square.
+    """
+    targets = []
+    scouts = side.bitboards["Scout"]
+    if not scouts:
+        return targets
+    allowed = FULL & ~side.occupied & ~LAKE_MASK
+    # The squares a Scout can move on past.
+    empty = allowed & ~side.game.opponent(side).occupied
+    for step, edge in STEPS:
+        squares = scouts
+        distance = 0
+        while squares:
+            distance += 1
+            if step > 0:
+                squares = (squares & edge) << step & allowed
+            else:
+                squares = (squares & edge) >> -step & allowed
+            if squares:
+                targets.append((step, distance, squares))
+                squares &= empty
+    return targets
+
+
+def get_forbidden_move(side, /):
+    """
+    Return the move, as an int (see ``get_moves()``), that ``side`` may
+    not make because of the two-square rule (see
+    ``GameState.get_forbidden_square()``), or None.
+    """
+    last_two_moves = side.last_two_moves
+    if all(last_two_moves):
+        (start1, end1), (start2, end2) = last_two_moves
+        if start1 == end2 and end1 == start2:
+            return square_index(start1) | square_index(end1) << END_SHIFT
+    return None
+
+
+def get_moves(side, /):
+    """
+    Return the list of every move ``side`` can make, as ints holding the
+    indices of the start square (``move & SQUARE_MASK``) and of the end
+    square (``move >> END_SHIFT``). These are the same moves as
+    ``GameState.get_open_squares()`` gives for each of the side's pieces.
+
+    The ints are built here rather than as ``(start, end)`` pairs, so that
+    ``stratego.engine.moves.generate_moves()`` does not have to pack them
+    again.
+    """
+    moves = []
+    append = moves.append
+    targets = get_step_targets(side)
+    targets.extend((step * distance, squares) for step, distance, squares
+                   in get_scout_targets(side))
+    for step, squares in targets:
+        while squares:
+            end = (squares & -squares).bit_length() - 1
+            append(end << END_SHIFT | end - step)
+            squares &= squares - 1
+    forbidden = get_forbidden_move(side)
+    if forbidden is not None and forbidden in moves:
+        moves.remove(forbidden)
+    return moves
+
+
+def count_moves(side, /):
+    """
+    Return how many moves ``side`` can make, without listing them.
+    """
+    count = 0
+    for step, squares in get_step_targets(side):
+        count += squares.bit_count()
+    for step, distance, squares in get_scout_targets(side):
+        count += squares.bit_count()
+    if count and get_forbidden_move(side) is not None:
+        # The forbidden move may or may not be among the ones counted.
+        return len(get_moves(side))
+    return count
@@ -0,0 +1,64 @@
+"""
+The shape of the board: its squares, lakes and directions, and how the
+squares are numbered.
+"""
+
+# The squares covered by the two lakes in the middle of the board.
+LAKES = frozenset((x, y) for x in (3, 4, 7, 8) for y in (5, 6))
+# The directions a piece can move in, in the order their squares are
+# listed by ``GameState.get_open_squares()``.
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def square_index(coords, /):
+    """
+    Return the index of the square ``coords`` in ``GameState.occupants``
+    and in bitboards: the squares are numbered row by row, from 0 at
+    (1, 1) to 99 at (10, 10).
+    """
+    x, y = coords
+    if not (0 < x < 11 and 0 < y < 11):
+        raise ValueError(f"Square {coords} is not on the board")
+    return (y - 1) * 10 + x - 1
+
+
+def square_coords(index, /):
+    """Return the ``(x, y)`` coordinates of the square with ``index``."""
+    y, x = divmod(index, 10)
+    return x + 1, y + 1
+
+
+def get_neighbours(index, /):
+    """
+    Return the indices of the squares next to the square with ``index``,
+    in the order of ``DIRECTIONS``, leaving out the lakes.
+    """
+    return tuple(ray[0] for ray in get_rays(index) if ray)
+
+
+def get_rays(index, /):
+    """
+    Return, for each of the ``DIRECTIONS``, the indices of the squares in
+    a straight line from the square with ``index`` to the edge of the
+    board, nearest first, and stopping before the first lake.
+    """
+    x, y = square_coords(index)
+    rays = []
+    for dx, dy in DIRECTIONS:
+        ray = []
+        coords = x + dx, y + dy
+        while (0 < coords[0] < 11 and 0 < coords[1] < 11
+                and coords not in LAKES):
+            ray.append(square_index(coords))
+            coords = coords[0] + dx, coords[1] + dy
+        rays.append(tuple(ray))
+    return tuple(rays)
+
+
+# The coordinates of each square, by index.
+SQUARES = tuple(square_coords(index) for index in range(100))
+# The squares a piece can step to and the lines a Scout can move along,
+# from each square, by index. They are worked out once here, so finding a
+# piece's moves is just a walk along them.
+NEIGHBOURS = tuple(get_neighbours(index) for index in range(100))
+RAYS = tuple(get_rays(index) for index in range(100))
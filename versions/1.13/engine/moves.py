@@ -0,0 +1,155 @@
+"""
+Moves as ints, for searching through games.
+
+Each move is a single int, which holds everything needed both to make the
+move and to take it back again:
+    - bits 0 to 6: the index of the square the piece moves from (see
+      ``square_index()``),
+    - bits 7 to 13: the index of the square it moves to,
+    - bits 14 to 19: the index, plus one, of the enemy piece it strikes in
+      its side's list of pieces, or 0 if it does not strike any,
+    - bits 20 to 22: the result of the strike: NO_STRIKE, WON, LOST,
+      BOTH_LOST or FLAG_CAPTURED.
+
+make_move() changes a ``GameState`` in place, and unmake_move() puts it
+back exactly as it was, so a search can walk a whole tree of moves
+without copying the state.
+
+How to use ``stratego.engine.moves``
+------------------------------------
+>>> for move in generate_moves(game):
+...     make_move(game, move)
+...     ...
+...     unmake_move(game, move)
+Moves must be taken back in the opposite order to the one they were made
+in.
+"""
+from stratego.engine.pieces import strike, ACTIVE
+from stratego.engine.geometry import SQUARES
+from stratego.engine import bitboards
+from stratego.engine.bitboards import SQUARE_MASK, END_SHIFT
+
+NO_STRIKE = 0
+WON = 1
+LOST = 2
+BOTH_LOST = 3
+FLAG_CAPTURED = 4
+# The results of ``strike()``, as they are written into a move.
+STRIKE_RESULTS = {True: WON, False: LOST, None: BOTH_LOST,
+                  "Flag": FLAG_CAPTURED}
+
+CAPTURED_SHIFT = 14
+CAPTURED_MASK = 0b111111
+RESULT_SHIFT = 20
+
+
+def encode_move(start, end, /, captured=None, result=NO_STRIKE):
+    """
+    Return the int for the move from the square ``start`` to the square
+    ``end`` (both indices), striking the piece with index ``captured``, if
+    any, with the given result.
+    """
+    move = start | end << END_SHIFT | result << RESULT_SHIFT
+    if captured is not None:
+        move |= (captured + 1) << CAPTURED_SHIFT
+    return move
+
+
+def get_start(move, /):
+    """Return the index of the square ``move`` starts from."""
+    return move & SQUARE_MASK
+
+
+def get_end(move, /):
+    """Return the index of the square ``move`` ends on."""
+    return move >> END_SHIFT & SQUARE_MASK
+
+
+def get_captured(move, /):
+    """
+    Return the index of the piece ``move`` strikes, in its side's list of
+    pieces, or None.
+    """
+    captured = move >> CAPTURED_SHIFT & CAPTURED_MASK
+    return captured - 1 if captured else None
+
+
+def get_result(move, /):
+    """Return the result of the strike made by ``move``."""
+    return move >> RESULT_SHIFT
+
+
+def generate_moves(state, /):
+    """
+    Return the list of moves the side whose turn it is can make, as ints,
+    or an empty list if the game is over.
+    """
+    if state.pending:
+        raise ValueError("The last strike has not been resolved yet")
+    if state.winner is not None:
+        return []
+    occupants = state.occupants
+    moves = []
+    for move in bitboards.get_moves(state.turn):
+        defender = occupants[move >> END_SHIFT]
+        if defender is None:
+            moves.append(move)
+        else:
+            result = STRIKE_RESULTS[strike(occupants[move & SQUARE_MASK].rank,
+                                           defender.rank)]
+            moves.append(move | (defender.index + 1) << CAPTURED_SHIFT
+                         | result << RESULT_SHIFT)
+    return moves
+
+
+def make_move(state, move, /):
+    """
+    Make ``move``, deciding its strike if it makes one, and end the turn
+    (see ``GameState.end_turn()``).
+    """
+    start = move & SQUARE_MASK
+    end = move >> END_SHIFT & SQUARE_MASK
+    result = move >> RESULT_SHIFT
+    piece = state.occupants[start]
+    side = piece.side
+    state.history.append((piece, side.last_two_moves, state.winner,
+                          state.turn))
+    side.last_two_moves = side.last_two_moves[1], (SQUARES[start],
+                                                   SQUARES[end])
+    state._take(start)
+    if result != NO_STRIKE:
+        if result != LOST:
+            state.capture(state.occupants[end])
+        if result == LOST or result == BOTH_LOST:
+            state.capture(piece)
+        elif result == FLAG_CAPTURED:
+            state.winner = side
+    if piece.state == ACTIVE:
+        piece.x, piece.y = SQUARES[end]
+        state._put(piece, end)
+    state.end_turn(side)
+
+
+def unmake_move(state, move, /):
+    """
+    Take back ``move``, which must be the last move made with make_move()
+    that has not been taken back yet.
+    """
+    start = move & SQUARE_MASK
+    end = move >> END_SHIFT & SQUARE_MASK
+    result = move >> RESULT_SHIFT
+    piece, last_two_moves, winner, turn = state.history.pop()
+    side = piece.side
+    if piece.state == ACTIVE:
+        state._take(end)
+    if result != NO_STRIKE and result != LOST:
+        defender = state.opponent(side).pieces[get_captured(move)]
+        defender.state = ACTIVE
+        defender.x, defender.y = SQUARES[end]
+        state._put(defender, end)
+    piece.state = ACTIVE
+    piece.x, piece.y = SQUARES[start]
+    state._put(piece, start)
+    side.last_two_moves = last_two_moves
+    state.winner = winner
+    state.turn = turn
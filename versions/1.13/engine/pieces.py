@@ -0,0 +1,63 @@
+"""The gamepieces of Stratego, and how they fight."""
+
+# The states a piece can be in: not on the board yet, on the board, or
+# taken off it.
+CREATED = 0
+ACTIVE = 1
+KILLED = 2
+
+RANKS = {"Marshall": 1, "General": 2, "Colonel": 3, "Major": 4,
+         "Captain": 5, "Lieutenant": 6, "Sergeant": 7, "Miner": 8,
+         "Scout": 9, "Spy": "Spy", "Bomb": "Bomb", "Flag": "Flag"}
+# The 40 pieces each side has.
+PIECE_NAMES = (("Marshall",) + ("General",) + ("Colonel",)*2 + ("Major",)*3
+               + ("Captain",)*4 + ("Lieutenant",)*4 + ("Sergeant",)*4
+               + ("Miner",)*5 + ("Scout",)*8 + ("Spy",) + ("Bomb",)*6
+               + ("Flag",))
+# Pieces that can never move.
+IMMOVABLE = frozenset(("Bomb", "Flag"))
+
+
+class Piece:
+    """
+    One gamepiece: its name and rank, which side it belongs to (and where
+    it is in the side's list of pieces), and where it is on the board
+    (``x`` and ``y`` are None unless it is active).
+    """
+    __slots__ = ("name", "rank", "side", "index", "state", "x", "y")
+
+    def __init__(self, /, name, side, index):
+        if name not in RANKS:
+            raise ValueError(f"No gamepiece is called {name!r}")
+        self.name = name
+        self.rank = RANKS[name]
+        self.side = side
+        self.index = index
+        self.state = CREATED
+        self.x = None
+        self.y = None
+
+    def __repr__(self, /):
+        return f"<Piece {self.name} at {self.x}, {self.y}>"
+
+
+def strike(rank1, rank2, /):
+    """
+    Return the result of a piece of rank ``rank1`` striking a piece of
+    rank ``rank2``: True if the striking piece wins, False if it loses,
+    None if both lose, or "Flag" if the flag was captured.
+    """
+    if rank1 == rank2:
+        return None
+    if isinstance(rank1, int) and isinstance(rank2, int):
+        return rank1 < rank2
+    # Note that since rank1 is the moving piece, it cannot be a bomb or
+    # a flag.
+    if rank2 == "Bomb":
+        return rank1 == 8
+    elif rank2 == "Flag":
+        return "Flag"
+    elif rank2 == "Spy":
+        return True
+    if rank1 == "Spy":
+        return rank2 == 1
@@ -0,0 +1,312 @@
+"""The state of a game of Stratego, and the moves that change it."""
+from stratego.engine.pieces import (
+    Piece,
+    strike,
+    CREATED,
+    ACTIVE,
+    KILLED,
+    PIECE_NAMES,
+    IMMOVABLE
+)
+from stratego.engine.geometry import (
+    SQUARES,
+    NEIGHBOURS,
+    RAYS,
+    square_index
+)
+from stratego.engine import bitboards
+
+
+class Side:
+    """
+    One of the two sides in a game: its 40 pieces, and the last two moves
+    it made (each as ``((x1, y1), (x2, y2))``, or None).
+
+    ``occupied`` is a bitboard of the squares the side's pieces are on: an
+    int with bit ``square_index(coords)`` set for each of them. The squares
+    of each kind of piece are in ``bitboards``, by the pieces' names. (See
+    ``stratego.engine.bitboards``.)
+    """
+    def __init__(self, /, game, index):
+        self.game = game
+        self.index = index
+        self.pieces = [Piece(name, self, index)
+                       for index, name in enumerate(PIECE_NAMES)]
+        self.last_two_moves = None, None
+        self.occupied = 0
+        self.bitboards = dict.fromkeys(PIECE_NAMES, 0)
+
+    def active_pieces(self, /):
+        return [piece for piece in self.pieces if piece.state == ACTIVE]
+
+    def pieceat(self, /, coords):
+        """Return this side's piece on the square ``coords``, or None."""
+        piece = self.game.pieceat(coords)
+        if piece is not None and piece.side is self:
+            return piece
+        # A piece that has just struck shares its square with the piece
+        # it struck until the strike is resolved.
+        if self.game.pending:
+            attacker = self.game.pending[0]
+            if attacker.side is self and (attacker.x, attacker.y) == coords:
+                return attacker
+        return None
+
+    def is_square_occupied(self, /, coords):
+        return self.pieceat(coords) is not None
+
+    def has_movable_pieces(self, /):
+        return bitboards.count_moves(self) > 0
+
+
+class GameState:
+    """
+    Where all the pieces of both sides are, and who has won, if anyone.
+
+    How to use the ``GameState`` class
+    ----------------------------------
+    1. Create the game and its two sides:
+    >>> game = GameState()
+    >>> red, blue = game.add_side(), game.add_side()
+    The first side added moves first, unless start() says otherwise:
+    >>> game.start(blue)
+    2. Put every piece on the board, and swap them around if you like:
+    >>> game.place(red.pieces[0], (1, 7))
+    >>> game.swap(red.pieces[0], red.pieces[1])
+    3. Make moves until someone wins:
+    >>> squares = game.get_open_squares(red.pieces[0])
+    >>> game.apply_move(red.pieces[0], squares[0])
+    >>> game.winner
+    A move can also be made in steps, as the game screens do: move()
+    moves the piece, resolve_strike() decides a strike it started, and
+    end_turn() checks whether the other side can still move.
+    """
+    def __init__(self, /):
+        self.sides = []
+        # The piece on each square, or None, by square_index(). It is kept
+        # up to date by every method that moves a piece, so looking up a
+        # square never has to go through the pieces. A piece that has
+        # struck another is not in here until the strike is resolved.
+        self.occupants = [None] * 100
+        # The (attacker, defender) pair of a strike that has not been
+        # resolved yet.
+        self.pending = None
+        self.winner = None
+        # The side whose turn it is: the first side (or the one given to
+        # start()), until end_turn() is called.
+        self.turn = None
+        # What make_move() needs to undo each move it has made (see
+        # ``stratego.engine.moves``).
+        self.history = []
+
+    def add_side(self, /):
+        """Add one of the two sides to the game, and return it."""
+        if len(self.sides) == 2:
+            raise ValueError("A game of Stratego has only two sides")
+        side = Side(self, len(self.sides))
+        self.sides.append(side)
+        if self.turn is None:
+            self.turn = side
+        return side
+
+    def start(self, /, side):
+        """Make ``side`` the side that moves first."""
+        if side not in self.sides:
+            raise ValueError(f"{side!r} is not a side of this game")
+        if self.history or any(s.last_two_moves != (None, None)
+                               for s in self.sides):
+            raise ValueError("The game has already started")
+        self.turn = side
+
+    def opponent(self, /, side):
+        return self.sides[1 - side.index]
+
+    def pieceat(self, /, coords):
+        """Return the piece of either side on ``coords``, or None."""
+        return self.occupants[square_index(coords)]
+
+    def _put(self, /, piece, index):
+        """Put ``piece`` on the empty square with the given index."""
+        self.occupants[index] = piece
+        bit = 1 << index
+        side = piece.side
+        side.occupied |= bit
+        side.bitboards[piece.name] |= bit
+
+    def _take(self, /, index):
+        """Take the piece off the square with the given index."""
+        piece = self.occupants[index]
+        self.occupants[index] = None
+        bit = 1 << index
+        side = piece.side
+        side.occupied ^= bit
+        side.bitboards[piece.name] ^= bit
+
+    def place(self, /, piece, coords):
+        """Put a piece that is not on the board yet onto ``coords``."""
+        if piece.state != CREATED:
+            raise ValueError(f"{piece!r} is already on the board")
+        index = square_index(coords)
+        if self.occupants[index] is not None:
+            raise ValueError(f"Square {coords} is already occupied")
+        piece.x, piece.y = coords
+        piece.state = ACTIVE
+        self._put(piece, index)
+
+    def swap(self, /, piece1, piece2):
+        """Swap two pieces' squares, as the players do while setting up."""
+        if piece1 is piece2:
+            return
+        coords1 = piece1.x, piece1.y
+        coords2 = piece2.x, piece2.y
+        index1 = square_index(coords1)
+        index2 = square_index(coords2)
+        self._take(index1)
+        self._take(index2)
+        piece1.x, piece1.y = coords2
+        piece2.x, piece2.y = coords1
+        self._put(piece2, index1)
+        self._put(piece1, index2)
+
+    def get_forbidden_square(self, /, piece):
+        """
+        Return the square ``piece`` may not move to because it would be
+        the third time in a row it moved back and forth between the same
+        two squares, or None.
+        """
+        last_two_moves = piece.side.last_two_moves
+        if all(last_two_moves):
+            if (last_two_moves[0][0] == last_two_moves[1][1]
+                    == (piece.x, piece.y) and last_two_moves[0][1]
+                    == last_two_moves[1][0]):
+                return last_two_moves[0][1]
+        return None
+
+    def get_open_squares(self, /, piece):
+        """Return the list of squares ``piece`` can move to."""
+        if piece.name == "Scout":
+            return self.get_scout_squares(piece)
+        else:
+            return self.get_squares(piece)
+
+    def get_squares(self, /, piece):
+        """
+        Return the squares a piece that moves one square at a time can
+        move to.
+        """
+        if piece.state != ACTIVE:
+            raise ValueError(f"{piece!r} is not active")
+        if piece.name in IMMOVABLE:
+            return []
+        squares = []
+        forbidden_square = self.get_forbidden_square(piece)
+        occupants = self.occupants
+        side = piece.side
+        for index in NEIGHBOURS[(piece.y - 1) * 10 + piece.x - 1]:
+            occupant = occupants[index]
+            if occupant is None or occupant.side is not side:
+                coords = SQUARES[index]
+                if coords != forbidden_square:
+                    squares.append(coords)
+        return squares
+
+    def get_scout_squares(self, /, piece):
+        """
+        Return the squares a Scout can move to: any number of empty
+        squares in a straight line, and the first enemy piece in the way.
+        """
+        forbidden_square = self.get_forbidden_square(piece)
+        occupants = self.occupants
+        side = piece.side
+        squares = []
+        for ray in RAYS[(piece.y - 1) * 10 + piece.x - 1]:
+            for index in ray:
+                occupant = occupants[index]
+                if occupant is not None and occupant.side is side:
+                    break
+                coords = SQUARES[index]
+                if coords != forbidden_square:
+                    squares.append(coords)
+                if occupant is not None:
+                    break
+        return squares
+
+    def move(self, /, piece, coords):
+        """
+        Move ``piece`` to ``coords``, which must be one of its open squares
+        (see get_open_squares()), and return the enemy piece there, if
+        any. If there is one, the strike must then be decided with
+        resolve_strike().
+        """
+        if self.pending:
+            raise ValueError("The last strike has not been resolved yet")
+        index = square_index(coords)
+        defender = self.occupants[index]
+        start = piece.x, piece.y
+        side = piece.side
+        side.last_two_moves = side.last_two_moves[1], (start, coords)
+        self._take(square_index(start))
+        piece.x, piece.y = coords
+        if defender is None:
+            self._put(piece, index)
+        else:
+            self.pending = piece, defender
+        return defender
+
+    def capture(self, /, piece):
+        """Take ``piece`` off the board."""
+        index = square_index((piece.x, piece.y))
+        if self.occupants[index] is piece:
+            self._take(index)
+        piece.x = piece.y = None
+        piece.state = KILLED
+
+    def resolve_strike(self, /):
+        """
+        Decide the strike started by the last move, take the losing piece
+        or pieces off the board, and return the result (see ``strike()``)
+        and the list of losing pieces, attacker first.
+        """
+        attacker, defender = self.pending
+        self.pending = None
+        result = strike(attacker.rank, defender.rank)
+        if result is None:
+            losers = [attacker, defender]
+        elif result == False:
+            losers = [attacker]
+        else:
+            losers = [defender]
+        for loser in losers:
+            self.capture(loser)
+        if attacker.state == ACTIVE:
+            self._put(attacker, square_index((attacker.x, attacker.y)))
+        if result == "Flag":
+            self.winner = attacker.side
+        return result, losers
+
+    def end_turn(self, /, side):
+        """
+        Finish ``side``'s turn: if the other side has no piece it can
+        move, ``side`` wins. Return the winner, if there is one.
+        """
+        self.turn = self.opponent(side)
+        if self.winner is None:
+            if not self.opponent(side).has_movable_pieces():
+                self.winner = side
+        return self.winner
+
+    def apply_move(self, /, piece, coords):
+        """
+        Play a whole turn: move ``piece`` to ``coords``, decide the strike
+        if there is one, and check whether the game is over. Return the
+        list of pieces that were taken off the board.
+        """
+        losers = []
+        if self.move(piece, coords) is not None:
+            result, losers = self.resolve_strike()
+        self.end_turn(piece.side)
+        return losers
+
+    @property
+    def is_over(self, /):
+        return self.winner is not None
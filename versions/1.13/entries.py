@@ -1,5 +1,6 @@
 from stratego.colors import Colors, pygame
-from stratego.backend import DEFAULT_FONT
+from stratego.backend import render_text, get_font, DEFAULT_FONT
+from stratego.scheduler import mark_dirty
 
 
 class Entry:
@@ -84,7 +85,7 @@ class Entry:
         self.active_char = ''
         self.count = 0
         self.text = ''
-        self.font = font = pygame.font.SysFont(DEFAULT_FONT, self.height-10)
+        self.font = font = get_font(DEFAULT_FONT, self.height-10)
 
     def render(self, /, show_text=True):
         """
@@ -117,10 +118,11 @@ class Entry:
                          (self.x+1, self.y+1, self.width-2, self.height-2))
         if show_text:
             # Write the text back onto/"into" the field.
-            text_obj = self.font.render(self.text, True, Colors.BLACK)
+            text_obj = render_text(self.font, self.text, True, Colors.BLACK)
             # Leave an additional 2px "border" between the text itself and the
             # edge of the white box.
             self.display.blit(text_obj, (self.x+3, self.y+3))
+        mark_dirty()
 
     def validate_input_length(self, /, text_obj):
         """
@@ -149,7 +151,7 @@ class Entry:
             raise ValueError("Entry.process_event() expected pygame.Event "
                              f"object, got {event!r}")
         if event.type == pygame.MOUSEBUTTONUP:
-            pos = pygame.mouse.get_pos()
+            pos = event.pos
             x = pos[0] - self.x_deficit
             y = pos[1] - self.y_deficit
             if (self.x < x < self.x+self.width
@@ -232,10 +234,12 @@ class Entry:
                 # Give the user a moment to release Backspace
                 pygame.time.wait(130)
             if self.text != original_text:
-                text_obj = self.font.render(self.text, True, Colors.BLACK)
+                text_obj = render_text(self.font, self.text, True,
+                                       Colors.BLACK)
                 # Ensure that text can fit into field
                 if self.validate_input_length(text_obj):
                     self.display.blit(text_obj, (self.x+3, self.y+3))
+                    mark_dirty()
                 else:
                     self.text = original_text
 
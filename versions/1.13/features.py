@@ -4,45 +4,68 @@ from stratego.backend import (
     notify_about_click,
     exit_game,
     center_text,
+    render_text,
+    get_font,
+    prepare_surface,
     GAMEPIECE_WIDTH,
     GAMEPIECE_HEIGHT,
     EVENTS,
     DEFAULT_FONT
 )
+from stratego.compositor import Compositor, fill_white
+from stratego.scheduler import get_events, present, mark_dirty
+
+
+# The gamepiece log can be opened again and again during a game, so its
+# compositor, with the layers it allocates, is only made once per display.
+_log_compositors = {}
 
 
 def show_gamepiece_log(display, player1, player2):
     font_size = int(player1.board.CONSTANT / 13)
     x = player1.board.x / 2
-    font = pygame.font.SysFont(DEFAULT_FONT, font_size)
+    font = get_font(DEFAULT_FONT, font_size)
     text = (
-        font.render("Gamepiece Log", True, Colors.BLACK),
-        font.render("Faded pieces are", True, Colors.BLACK),
-        font.render("dead.", True, Colors.BLACK)
+        render_text(font, "Gamepiece Log", True, Colors.BLACK),
+        render_text(font, "Faded pieces are", True, Colors.BLACK),
+        render_text(font, "dead.", True, Colors.BLACK)
     )
-    def render():
-        display.fill(Colors.WHITE)
+    def draw_hud(surface):
         y = font_size
         for string in text:
             rect = string.get_rect()
             rect.center = (x, y)
-            display.blit(string, rect)
+            surface.blit(string, rect)
             y += font_size + 6
-        player1.board.render()
-        for piece in player1.pieces:
-            piece.show_orig_pos()
-        for piece in player2.pieces:
-            piece.show_orig_pos()
-        Button.clear_all_buttons()
-        Button("Leave", x-50, display.get_height()/2, 100, 50,
-               Colors.DULL_GREEN, Colors.GREEN, display, notify_about_click,
-               (True,))
+
+    def draw_pieces(surface):
+        for piece in player1.pieces + player2.pieces:
+            piece.show_orig_pos(surface)
+
+    if display not in _log_compositors:
+        _log_compositors[display] = Compositor(display)
+    compositor = _log_compositors[display]
+    board_rect = player1.board.get_rect()
+    compositor.set_layer(Compositor.BACKGROUND, fill_white, opaque=True)
+    compositor.set_layer(Compositor.BOARD, player1.board.render,
+                         opaque=True, rect=board_rect)
+    compositor.set_layer(Compositor.PIECES, draw_pieces, rect=board_rect)
+    compositor.set_layer(Compositor.HUD, draw_hud,
+                         rect=player1.board.get_side_rect())
+
+    leave_button = Button("Leave", x-50, display.get_height()/2, 100, 50,
+                          Colors.DULL_GREEN, Colors.GREEN, display,
+                          notify_about_click, (True,))
+
+    def render():
+        compositor.refresh()
+        Button.show_buttons(leave_button)
     render()
 
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     return
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -58,8 +81,7 @@ def show_gamepiece_log(display, player1, player2):
             elif event.type in EVENTS:
                 render()
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
 
 
 def show_ranks(display, player):
@@ -70,35 +92,38 @@ def show_ranks(display, player):
     width = display.get_width()
     height = display.get_height()
 
-    bigfont = pygame.font.SysFont(DEFAULT_FONT, 30)
-    text = bigfont.render("Ranks", True, Colors.BLACK)
-    font = pygame.font.SysFont(DEFAULT_FONT, 12)
+    bigfont = get_font(DEFAULT_FONT, 30)
+    text = render_text(bigfont, "Ranks", True, Colors.BLACK)
+    font = get_font(DEFAULT_FONT, 12)
     for piece in player.pieces:
         if piece.representative:
             surface.blit(piece.img, (x, 0))
-            name = font.render(piece.name, True, Colors.BLACK)
+            name = render_text(font, piece.name, True, Colors.BLACK)
             surface.blit(name, (x, GAMEPIECE_HEIGHT + 5))
             if isinstance(piece.rank, int):
-                number = font.render(str(piece.rank), True, Colors.BLACK)
+                number = render_text(font, str(piece.rank), True, Colors.BLACK)
                 surface.blit(number, (x, GAMEPIECE_HEIGHT + 25))
-            num = font.render(f"({piece.representative}x)", True, Colors.BLACK)
+            num = render_text(font, f"({piece.representative}x)", True,
+                              Colors.BLACK)
             surface.blit(num, (x, GAMEPIECE_HEIGHT + 45))
             x += GAMEPIECE_WIDTH + 35
+    surface = prepare_surface(surface)
+    leave_button = Button("Leave", width/2-50, height-75, 100, 50,
+                          Colors.DULL_GREEN, Colors.GREEN, display,
+                          notify_about_click, (True,))
 
     def render():
         display.fill(Colors.WHITE)
         center_text(text, display, y=50)
-        Button.clear_all_buttons()
-        Button("Leave", width/2-50, height-75, 100, 50, Colors.DULL_GREEN,
-               Colors.GREEN, display, notify_about_click, (True,))
+        Button.show_buttons(leave_button)
         # Spoiler: center_text() can center anything, not just text
         center_text(surface, display)
     render()
 
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     return
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -114,8 +139,7 @@ def show_ranks(display, player):
             elif event.type in EVENTS:
                 render()
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
 
 
 def warn_to_leave(display, /):
@@ -123,24 +147,25 @@ def warn_to_leave(display, /):
     blacksurf.fill(Colors.BLACK)
     whitesurf = pygame.Surface((596, 796))
     whitesurf.fill(Colors.WHITE)
-    font = pygame.font.SysFont(DEFAULT_FONT, 30)
-    text = font.render("Do you want to close game?", True, Colors.BLACK)
+    font = get_font(DEFAULT_FONT, 30)
+    text = render_text(font, "Do you want to close game?", True, Colors.BLACK)
     center_text(whitesurf, blacksurf)
     center_text(text, blacksurf, y=250)
     center_text(blacksurf, display)
     x = display.get_width()/2 - 100
     y1 = display.get_height()/2  - 100
     y2 = display.get_height()/2
-    Button.clear_all_buttons()
-    Button("Yes [Y]", x, y1, 200, 50, Colors.DULL_RED, Colors.RED, display,
-           notify_about_click, (True,))
-    Button("No [N]", x, y2, 200, 50, Colors.DULL_GREEN, Colors.GREEN, display,
-           notify_about_click, (False,))
+    Button.show_buttons(
+        Button("Yes [Y]", x, y1, 200, 50, Colors.DULL_RED, Colors.RED,
+               display, notify_about_click, (True,)),
+        Button("No [N]", x, y2, 200, 50, Colors.DULL_GREEN, Colors.GREEN,
+               display, notify_about_click, (False,))
+    )
 
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                result = Button.process_click()
+                result = Button.process_click(event.pos)
                 if result == True:
                     return True
                 elif result == False:
@@ -156,5 +181,22 @@ def warn_to_leave(display, /):
                 exit_game()
 
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
+
+
+def handle_pause_event(display, event, /):
+    """
+    Handle an event that comes in during a pause (see
+    ``stratego.scheduler.run()``): close the game if the window is closed,
+    and ask whether to close it if Escape is pressed.
+    """
+    if event.type == pygame.QUIT:
+        exit_game()
+    elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        screen = display.copy()
+        if warn_to_leave(display):
+            exit_game()
+        # Put back whatever was being shown before the box was.
+        display.blit(screen, (0, 0))
+        Button.clear_all_buttons()
+        mark_dirty()
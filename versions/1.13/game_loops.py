@@ -1,19 +1,27 @@
 from stratego.buttons import Button, pygame
 from stratego.colors import Colors
 from stratego.gamepieces import Gamepiece
-from stratego.features import show_gamepiece_log, show_ranks, warn_to_leave
+from stratego.features import (
+    show_gamepiece_log,
+    show_ranks,
+    warn_to_leave,
+    handle_pause_event
+)
 from stratego.backend import (
     notify_about_click,
     exit_game,
     center_text,
     concat_surfaces,
-    wait,
+    render_text,
+    get_font,
+    prepare_surface,
     GAMEPIECE_WIDTH,
     GAMEPIECE_HEIGHT,
     EVENTS,
     DEFAULT_FONT,
     FANCY_FONT
 )
+from stratego.scheduler import get_events, present, run
 import sys
 
 
@@ -24,27 +32,29 @@ def game_intro(display):
         raise TypeError(msg)
 
     # Write "STRATEGO" in big Castellar letters
-    castellar = pygame.font.SysFont(FANCY_FONT, 80)
-    text = castellar.render("STRATEGO", True, Colors.BLACK)
+    castellar = get_font(FANCY_FONT, 80)
+    text = render_text(castellar, "STRATEGO", True, Colors.BLACK)
 
     display_width = display.get_width()
     x1 = display_width/2 - 250
     x2 = display_width/2 + 150
     y = display.get_height() - 150
-    def render():
-        display.fill(Colors.WHITE)
-        center_text(text, display, y=150)
-        Button.clear_all_buttons()
+    buttons = (
         Button("Play", x1, y, 100, 50, Colors.DULL_GREEN, Colors.GREEN,
-               display, notify_about_click, (True,))
+               display, notify_about_click, (True,)),
         Button("Exit", x2, y, 100, 50, Colors.DULL_RED, Colors.RED, display,
                exit_game)
+    )
+    def render():
+        display.fill(Colors.WHITE)
+        center_text(text, display, y=150)
+        Button.show_buttons(*buttons)
 
     render()
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     return
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -57,8 +67,7 @@ def game_intro(display):
             elif event.type in EVENTS:
                 render()
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
 
 
 def start_game(display, player1, player2):
@@ -68,8 +77,8 @@ def start_game(display, player1, player2):
 
     display_width = display.get_width()
     display_height = display.get_height()
-    font = pygame.font.SysFont(DEFAULT_FONT, 30)
-    text = font.render("and", True, Colors.BLACK)
+    font = get_font(DEFAULT_FONT, 30)
+    text = render_text(font, "and", True, Colors.BLACK)
     rect = text.get_rect()
     rect.centerx = display_width/2
     rect.top = 135
@@ -84,33 +93,36 @@ def start_game(display, player1, player2):
     rect2.left = display_width/2 + rect.width/2 + 12
     rect2.top = 135
 
-    text2 = font.render("the game is about to begin!", True, Colors.BLACK)
+    text2 = render_text(font, "the game is about to begin!", True,
+                        Colors.BLACK)
     its_rect = text2.get_rect()
     its_rect.centerx = display_width/2
     its_rect.top = 171
 
-    small_font = pygame.font.SysFont(DEFAULT_FONT, 15)
+    small_font = get_font(DEFAULT_FONT, 15)
     shortcuts = [
-        small_font.render("Keyboard Shortcuts:", True, Colors.BLACK),
-        small_font.render("F1: Show Ranks", True, Colors.BLACK),
-        small_font.render("F2: Show Gamepiece Log", True, Colors.BLACK),
-        small_font.render("Escape: Close Game", True, Colors.BLACK)
+        render_text(small_font, "Keyboard Shortcuts:", True, Colors.BLACK),
+        render_text(small_font, "F1: Show Ranks", True, Colors.BLACK),
+        render_text(small_font, "F2: Show Gamepiece Log", True, Colors.BLACK),
+        render_text(small_font, "Escape: Close Game", True, Colors.BLACK)
     ]
     if sys.platform == "darwin":
-        shortcuts.append(small_font.render("Command-H: Hide Game", True,
-                                           Colors.BLACK))
+        shortcuts.append(render_text(small_font, "Command-H: Hide Game", True,
+                                                 Colors.BLACK))
     x1 = display_width/2 - 300
     x2 = display_width/2 + 150
     y = display_height - 150
+    buttons = (
+        Button("Let's Go!", x1, y, 150, 50, Colors.DULL_GREEN, Colors.GREEN,
+               display, notify_about_click, (True,)),
+        Button("Exit", x2, y, 150, 50, Colors.DULL_RED, Colors.RED, display,
+               exit_game)
+    )
 
     def render():
         y = display_height - 150
         display.fill(Colors.WHITE)
-        Button.clear_all_buttons()
-        Button("Let's Go!", x1, y, 150, 50, Colors.DULL_GREEN, Colors.GREEN,
-               display, notify_about_click, (True,))
-        Button("Exit", x2, y, 150, 50, Colors.DULL_RED, Colors.RED, display,
-               exit_game)
+        Button.show_buttons(*buttons)
         display.blit(text, rect)
         display.blit(name1, rect1)
         display.blit(name2, rect2)
@@ -123,9 +135,9 @@ def start_game(display, player1, player2):
 
     render()
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     return
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -138,8 +150,7 @@ def start_game(display, player1, player2):
             elif event.type in EVENTS:
                 render()
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
 
 
 def start_moves(display, mover):
@@ -147,24 +158,26 @@ def start_moves(display, mover):
         msg = f"start_moves() expected pygame.Surface object, got {display!r}"
         raise TypeError(msg)
 
+    # Red moves first, and red is not always the first side of the game.
+    mover.side.game.start(mover.side)
     name = mover.name(30, with_comma=True)
     done = False
-    font = pygame.font.SysFont(DEFAULT_FONT, 30)
-    text = font.render("make your first move!", True, Colors.BLACK)
+    font = get_font(DEFAULT_FONT, 30)
+    text = render_text(font, "make your first move!", True, Colors.BLACK)
     btn_x = display.get_width()/2 - 50
     btn_y = display.get_height() - 150
+    go_button = Button("Go!", btn_x, btn_y, 100, 50, Colors.DULL_GREEN,
+                       Colors.GREEN, display, notify_about_click, (True,))
     def render():
         display.fill(Colors.WHITE)
         center_text(name, display, y=150)
         center_text(text, display, y=190)
-        Button.clear_all_buttons()
-        Button("Go!", btn_x, btn_y, 100, 50, Colors.DULL_GREEN, Colors.GREEN,
-               display, notify_about_click, (True,))
+        Button.show_buttons(go_button)
     render()
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     done = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -182,8 +195,7 @@ def start_moves(display, mover):
         if done:
             return
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
 
 
 def show_move(display, moving_player, other):
@@ -192,7 +204,7 @@ def show_move(display, moving_player, other):
         raise TypeError(msg)
 
     font_size = int(moving_player.board.CONSTANT / 13)
-    font = pygame.font.SysFont(DEFAULT_FONT, font_size)
+    font = get_font(DEFAULT_FONT, font_size)
     x = moving_player.board.x / 2
     display_height = display.get_height()
     y = display_height / 2
@@ -200,8 +212,17 @@ def show_move(display, moving_player, other):
     start_square = moving_player.board.get_square(*move[0])
     end_square = moving_player.board.get_square(*move[1])
     mover = moving_player.pieceat(move[1])
+    # Show the move again, from the start, to the other player.
     mover.x_pos, mover.y_pos = start_square.x, start_square.y
-    mover.gridx, mover.gridy = start_square.gridx, start_square.gridy
+    game = moving_player.board.game
+
+    btn_x = 8
+    width = moving_player.board.CONSTANT - 16
+    buttons = {}
+    for label in ("Show Move", "Make Next Move", "Continue"):
+        buttons[label] = Button(label, btn_x, y-25, width, 40,
+                               Colors.DULL_GREEN, Colors.GREEN, display,
+                               notify_about_click, (True,))
 
     def render(mode=0):
         display.fill(Colors.WHITE)
@@ -222,17 +243,13 @@ def show_move(display, moving_player, other):
                     display.blit(msg, rect)
                     other.render_pieces()
                 text = "Continue"
-            btn_x = 8
-            width = moving_player.board.CONSTANT - 16
-            Button.clear_all_buttons()
-            Button(text, btn_x, y-25, width, 40, Colors.DULL_GREEN,
-                   Colors.GREEN, display, notify_about_click, (True,))
+            Button.show_buttons(buttons[text])
     def game_loop(mode=0):
         done = False
         while True:
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == pygame.MOUSEBUTTONUP:
-                    if Button.process_click():
+                    if Button.process_click(event.pos):
                         done = True
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
@@ -250,8 +267,7 @@ def show_move(display, moving_player, other):
             if done:
                 break
             Button.listen()
-            pygame.display.update()
-            pygame.time.wait(10)
+            present()
     render()
     game_loop()
 
@@ -259,84 +275,89 @@ def show_move(display, moving_player, other):
     render(mode=None)
     strike = False
     if other.is_square_occupied(end_square):
-        text = font.render("STRIKE!", True, Colors.BLACK)
+        text = render_text(font, "STRIKE!", True, Colors.BLACK)
         center_text(text, display, x=x)
         attacked = other.pieceat(end_square)
         strike = True
     mover.move(end_square, moving_player, other, backside=True)
     if strike:
-        # Overwrite the word "Strike"
-        pygame.draw.rect(display, Colors.WHITE,
-                         (0, 0, moving_player.board.x, display_height))
-        vs = font.render("vs.", True, Colors.BLACK)
-        dies = font.render(" dies!", True, Colors.BLACK)
-        center_text(vs, display, x=x)
-
-        mover.render()
-        name1 = mover.get_name(font_size)
-        rect1 = name1.get_rect()
-        rect1.centery = y - font_size - 6
-        rect1.centerx = x
-        display.blit(name1, rect1)
-        pygame.display.update()
-        wait(1500)
-
-        attacked.render()
-        name2 = attacked.get_name(font_size)
-        rect2 = name2.get_rect()
-        rect2.centery = y + font_size + 6
-        rect2.centerx = x
-        display.blit(name2, rect2)
-        text = font.render("The victor is:", True, Colors.BLACK)
-        rect = text.get_rect()
-        rect.centery = y + font_size*2 + 12
-        rect.centerx = x
-        display.blit(text, rect)
-        pygame.display.update()
-        wait(1500)
-
-        result = test_strike(mover.rank, attacked.rank)
-        if result is None:
-            text = font.render("Neither one!", True, Colors.BLACK)
-            losers = [mover, attacked]
-
-        elif result == False:
-            rect2.centery = y + font_size * 3 + 18
-            display.blit(name2, rect2)
-            text = concat_surfaces(name1, dies)
-            losers = [mover]
-
-        else:
-            rect1.centery = y + font_size * 3 + 18
+        flag = None
+
+        def reveal():
+            nonlocal flag
+            # Overwrite the word "Strike"
+            pygame.draw.rect(display, Colors.WHITE,
+                             (0, 0, moving_player.board.x, display_height))
+            vs = render_text(font, "vs.", True, Colors.BLACK)
+            dies = render_text(font, " dies!", True, Colors.BLACK)
+            center_text(vs, display, x=x)
+
+            mover.render()
+            name1 = mover.get_name(font_size)
+            rect1 = name1.get_rect()
+            rect1.centery = y - font_size - 6
+            rect1.centerx = x
             display.blit(name1, rect1)
-            text = concat_surfaces(name2, dies)
-            losers = [attacked]
+            yield 1500
 
-        rect = text.get_rect()
-        if losers[1:]:
-            rect.centery = y + font_size * 3 + 18
-        else:
-            rect.centery = y + font_size * 4 + 24
-        rect.centerx = x
-        display.blit(text, rect)
+            attacked.render()
+            name2 = attacked.get_name(font_size)
+            rect2 = name2.get_rect()
+            rect2.centery = y + font_size + 6
+            rect2.centerx = x
+            display.blit(name2, rect2)
+            text = render_text(font, "The victor is:", True, Colors.BLACK)
+            rect = text.get_rect()
+            rect.centery = y + font_size*2 + 12
+            rect.centerx = x
+            display.blit(text, rect)
+            yield 1500
+
+            result = game.resolve_strike()[0]
+            # The pieces the engine took off the board, attacker first.
+            losers = [piece for piece in (mover, attacked)
+                      if piece.state == Gamepiece.KILLED]
+            if result is None:
+                text = render_text(font, "Neither one!", True, Colors.BLACK)
+
+            elif result == False:
+                rect2.centery = y + font_size * 3 + 18
+                display.blit(name2, rect2)
+                text = concat_surfaces(name1, dies)
+
+            else:
+                rect1.centery = y + font_size * 3 + 18
+                display.blit(name1, rect1)
+                text = concat_surfaces(name2, dies)
+
+            rect = text.get_rect()
+            if losers[1:]:
+                rect.centery = y + font_size * 3 + 18
+            else:
+                rect.centery = y + font_size * 4 + 24
+            rect.centerx = x
+            display.blit(text, rect)
+
+            for loser in losers:
+                loser.render(view=Gamepiece.LIGHTENED)
+                yield 1500
+                if loser.rank == "Flag":
+                    flag = loser
+                    return
+                loser.die()
 
-        for loser in losers:
-            loser.render(view=Gamepiece.LIGHTENED)
-            pygame.display.update()
-            wait(1500)
-            if loser.rank == "Flag":
-                flag = loser
-                render(mode=2)
-                game_loop(mode=2)
-                return True
-            loser.die()
+        run(reveal(), lambda event: handle_pause_event(display, event))
+        if flag:
+            render(mode=2)
+            game_loop(mode=2)
+            return True
 
     def get_rect(text):
         rect = text.get_rect()
         rect.center = (x, y-45)
         return rect
 
-    if other.has_movable_pieces(moving_player):
+    if game.end_turn(moving_player.side) is None:
         name = other.name(font_size, with_comma=True)
         rect = get_rect(name)
         render(mode=1)
@@ -347,47 +368,32 @@ def show_move(display, moving_player, other):
         name = other.name(font_size)
         namerect = name.get_rect()
         namerect.center = (x, y-81)
-        msg = font.render("has no legal moves!", True, Colors.BLACK)
+        msg = render_text(font, "has no legal moves!", True, Colors.BLACK)
         rect = get_rect(msg)
         render(mode=3)
         game_loop(mode=3)
         return True
 
 
-def test_strike(rank1, rank2):
-    if rank1 == rank2:
-        return None
-    if isinstance(rank1, int) and isinstance(rank2, int):
-        return rank1 < rank2
-    # Note that since rank1 is the moving piece, it cannot be a bomb or
-    # a flag.
-    if rank2 == "Bomb":
-        return rank1 == 8
-    elif rank2 == "Flag":
-        return "Flag"
-    elif rank2 == "Spy":
-        return True
-    if rank1 == "Spy":
-        return rank2 == 1
-
-
 def show_win(display, player1, player2):
     if player1.victorious:
         victor, loser = player1, player2
     else:
         victor, loser = player2, player1
-    font = pygame.font.SysFont(DEFAULT_FONT, 30)
-    text = font.render("has won!", True, Colors.BLACK)
+    font = get_font(DEFAULT_FONT, 30)
+    text = render_text(font, "has won!", True, Colors.BLACK)
     name = victor.name(30)
     flag_img = loser.pieces[-1].img
     x = display.get_width()/2 - GAMEPIECE_WIDTH/2
     y = display.get_height()/2 - GAMEPIECE_HEIGHT/2
     rectangle = pygame.Surface((GAMEPIECE_WIDTH*2 + 80, 15), pygame.SRCALPHA)
     rectangle.fill(victor.color)
-    rectangle = pygame.transform.rotate(rectangle, 45)
+    rectangle = prepare_surface(pygame.transform.rotate(rectangle, 45))
     rect = rectangle.get_rect(center=display.get_rect().center)
     btn_x = display.get_width()/2 - 50
     btn_y = display.get_height() - 150
+    home_button = Button("Home", btn_x, btn_y, 100, 50, Colors.DARK_BLUE,
+                         Colors.BLUE, display, notify_about_click, (True,))
 
     def render():
         display.fill(Colors.WHITE)
@@ -395,15 +401,13 @@ def show_win(display, player1, player2):
         center_text(text, display, y=86)
         display.blit(flag_img, (x, y))
         display.blit(rectangle, rect)
-        Button.clear_all_buttons()
-        Button("Home", btn_x, btn_y, 100, 50, Colors.DARK_BLUE, Colors.BLUE,
-               display, notify_about_click, (True,))
+        Button.show_buttons(home_button)
     render()
 
     while True:
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.MOUSEBUTTONUP:
-                if Button.process_click():
+                if Button.process_click(event.pos):
                     return
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -419,5 +423,4 @@ def show_win(display, player1, player2):
             elif event.type in EVENTS:
                 render()
         Button.listen()
-        pygame.display.update()
-        pygame.time.wait(10)
+        present()
@@ -1,38 +1,40 @@
-from stratego.images import pygame, lighten_image, get_gamepiece_imgs, flip_img
-from stratego.backend import GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT, DEFAULT_FONT
-from stratego.boards import SQUARE_SIZE
+from stratego.images import pygame, get_gamepiece_img
+from stratego.atlas import Atlas
+from stratego import animation
+from stratego.scheduler import mark_dirty, present
+from stratego.backend import render_text, get_font, DEFAULT_FONT
+from stratego import engine
 
 class Gamepiece:
-    """Gamepiece class for Stratego game."""
-    CREATED = 0
-    ACTIVE = 1
-    KILLED = 2
+    """
+    Gamepiece class for Stratego game.
 
-    LIGHTENED = 0
-    NORMAL = 1
-    BACK_VIEW = 2
+    A ``Gamepiece`` only shows a piece of ``stratego.engine``: its name,
+    rank, state and square all come from ``self.piece``, and only where it
+    is drawn on the display (``x_pos`` and ``y_pos``) is kept here.
+    """
+    CREATED = engine.CREATED
+    ACTIVE = engine.ACTIVE
+    KILLED = engine.KILLED
+
+    LIGHTENED = Atlas.LIGHTENED
+    NORMAL = Atlas.NORMAL
+    BACK_VIEW = Atlas.BACK_VIEW
 
     id = 0
     numbers = 1, 1, 2, 3, 4, 4, 4, 5, 8, 1, 6, 1
-    ranks = {"Marshall": 1, "General": 2, "Colonel": 3, "Major": 4,
-             "Captain": 5, "Lieutenant": 6, "Sergeant": 7, "Miner": 8,
-             "Scout": 9, "Spy": "Spy", "Bomb": "Bomb", "Flag": "Flag"}
-
-    def __init__(self, imgname, name, display, color, /):
-        self.img = pygame.image.load(imgname)
-        self.filename = imgname
-        self.state = Gamepiece.CREATED
-        self.name = name
-        self.display = display
+    ranks = engine.RANKS
+
+    def __init__(self, piece, board, color, /):
+        self.piece = piece
+        self.board = board
+        self.display = board.display
         self.color = color
         self.x_pos = None
         self.y_pos = None
-        self.gridx = None
-        self.gridy = None
-        self.initalx = None
+        self.initialx = None
         self.initialy = None
         self.id = Gamepiece.id
-        self.rank = Gamepiece.ranks[self.name]
         Gamepiece.id += 1
 
         id = self.id % 40
@@ -45,6 +47,46 @@ class Gamepiece:
             # (Marshall, General, etc.) that is a "representative."
             self.representative = Gamepiece.numbers[index]
 
+    @property
+    def name(self, /):
+        return self.piece.name
+
+    @property
+    def rank(self, /):
+        return self.piece.rank
+
+    @property
+    def state(self, /):
+        return self.piece.state
+
+    @property
+    def gridx(self, /):
+        return self.piece.x
+
+    @property
+    def gridy(self, /):
+        return self.piece.y
+
+    @property
+    def img(self, /):
+        """
+        The piece's image, shared with all other pieces of the same color
+        and rank.
+
+        Images are looked up when they are needed rather than when the
+        piece is created, so that pieces can be created while the images
+        are still being loaded in the background (see
+        ``stratego.atlas.start_loading()``).
+        """
+        return get_gamepiece_img(self.color, self.name)
+
+    @property
+    def atlas(self, /):
+        """
+        The atlas with all the views of the piece's color, scaled to the
+        size of the board's gamepieces.
+        """
+        return Atlas.get_scaled(self.color, self.board.piece_size)
 
     def assert_active(self, /):
         """Make sure that ``self`` is an active piece."""
@@ -56,10 +98,18 @@ class Gamepiece:
         return self.x_pos, self.y_pos, self.gridx, self.gridy
 
     def get_actual_pos(self, /, x, y) -> tuple:
-        actualx = int(x + (SQUARE_SIZE - GAMEPIECE_WIDTH) / 2)
-        actualy = int(y + (SQUARE_SIZE - GAMEPIECE_HEIGHT) / 2)
+        square_size = self.board.square_size
+        width, height = self.board.piece_size
+        actualx = int(x + (square_size - width) / 2)
+        actualy = int(y + (square_size - height) / 2)
         return actualx, actualy
 
+    def get_rect(self, /):
+        """Return the area of the display that ``self`` is drawn onto."""
+        self.assert_active()
+        return pygame.Rect(self.get_actual_pos(self.x_pos, self.y_pos),
+                           self.board.piece_size)
+
     def get_pic(self, /, lightened: bool = False):
         """
         Return an image of ``self``.
@@ -69,25 +119,32 @@ class Gamepiece:
         lightened: bool = False
             Decides whether to "lighten" (reduce the saturation of) the
             piece's image before returning it.
+
+        Both images come from the piece's atlas, so they are the same size
+        as the piece on the board, and are shared with all other pieces of
+        the same color and rank.
         """
         if lightened:
-            return lighten_image(self.filename)
+            return self.atlas.image(Atlas.LIGHTENED, self.name)
         else:
-            return self.img
+            return self.atlas.image(Atlas.NORMAL, self.name)
 
-    def show_orig_pos(self, /):
+    def show_orig_pos(self, /, surface=None):
         x, y = self.get_actual_pos(self.initialx, self.initialy)
         match self.state:
             case Gamepiece.ACTIVE:
-                self.display.blit(self.img, (x, y))
+                view = Gamepiece.NORMAL
             case Gamepiece.KILLED:
-                self.display.blit(self.get_pic(lightened=True), (x, y))
+                view = Gamepiece.LIGHTENED
             case _:
                 raise ValueError("Gamepiece has not been activated.")
+        (surface or self.display).blit(self.atlas.surface, (x, y),
+                                       self.atlas.rect(view, self.name))
 
-    def render(self, /, view=NORMAL):
+    def render(self, /, view=NORMAL, surface=None):
         """
-        Draw self to self.display.
+        Draw self to ``surface``, or to self.display if no surface is
+        given.
 
         Parameter
         ---------
@@ -97,28 +154,27 @@ class Gamepiece:
             be Gamepiece.LIGHTENED, to display a lightened image (for if
             the gamepiece is killed, etc.), or Gamepiece.BACK_VIEW, to
             show the piece's "back". This will just show a rectangle.
+
+        All the views come from the same atlas (see ``stratego.atlas``), so
+        this is always a single blit.
+
+        A piece that has just been killed can still be drawn lightened, as
+        long as it has not been taken off the display with die().
         """
-        self.assert_active()
-        actual_x, actual_y = self.get_actual_pos(self.x_pos, self.y_pos)
-
-        match view:
-            case Gamepiece.NORMAL:
-                self.display.blit(self.img, (actual_x, actual_y))
-            case Gamepiece.LIGHTENED:
-                self.display.blit(self.get_pic(lightened=True),
-                                  (actual_x, actual_y))
-            case Gamepiece.BACK_VIEW:
-                pygame.draw.rect(self.display, self.color,
-                                 (actual_x, actual_y,
-                                  GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT))
-            case _:
-                raise ValueError("Gamepiece.render() expected view of 0, 1, or "
-                                 "2 for lightened, normal, or backside, got "
-                                 f"{view}")
+        if view != Gamepiece.LIGHTENED or self.x_pos is None:
+            self.assert_active()
+        if view not in (Gamepiece.NORMAL, Gamepiece.LIGHTENED,
+                        Gamepiece.BACK_VIEW):
+            raise ValueError("Gamepiece.render() expected view of 0, 1, or "
+                             "2 for lightened, normal, or backside, got "
+                             f"{view}")
+        actual_pos = self.get_actual_pos(self.x_pos, self.y_pos)
+        (surface or self.display).blit(self.atlas.surface, actual_pos,
+                                       self.atlas.rect(view, self.name))
 
     def move(self, /, end_square, player1, player2, backside: bool = False):
         self.assert_active()
-        end_x, end_y, end_gridx, end_gridy = end_square.get_coords()
+        end_x, end_y = end_square.get_coords()[:2]
 
         # We cannot move diagonally - make that known:
         if end_x != self.x_pos and end_y != self.y_pos:
@@ -129,105 +185,59 @@ class Gamepiece:
             msg = "Gamepiece.move() was called with no movement specified"
             raise RuntimeError(msg)
 
-        if end_x != self.x_pos:
-            increment = 1 if end_x > self.x_pos else -1
-            def adjust_coord():
-                self.x_pos += increment
-            def done_moving():
-                return self.x_pos == end_x
-
-        elif end_y != self.y_pos:
-            increment = 1 if end_y > self.y_pos else -1
-            def adjust_coord():
-                self.y_pos += increment
-            def done_moving():
-                return self.y_pos == end_y
-
         view = Gamepiece.BACK_VIEW if backside else Gamepiece.NORMAL
+        board = player1.board
+
+        # Draw everything except this piece once, and keep a copy of the
+        # board. On each step of the movement, only the area the piece
+        # just left is restored from that copy, and only the area the
+        # piece covers, before and after the step, is updated.
+        board.render()
+        player2.render_pieces(view=Gamepiece.BACK_VIEW)
+        for piece in player1.pieces:
+            if piece.state == Gamepiece.ACTIVE and piece is not self:
+                piece.render(view=view)
+        board_rect = board.get_rect()
+        background = self.display.subsurface(board_rect).copy()
+        self.render(view=view)
+        # The whole display is updated once before the piece starts to
+        # move, so that whatever the caller drew around the board (such as
+        # "STRIKE!" in the side panel, or a button it has just removed)
+        # is shown during the movement, not after it.
+        mark_dirty()
+        present()
+
+        def step(pos):
+            old_rect = self.get_rect()
+            self.x_pos, self.y_pos = pos
+            new_rect = self.get_rect()
+            self.display.blit(background, old_rect,
+                              old_rect.move(-board_rect.x, -board_rect.y))
+            self.render(view=view)
+            present([old_rect.union(new_rect)])
+
+        # The movement takes the same time on any computer, and never
+        # more than ``animation.MAX_MOVE_DURATION``, however far it goes.
+        distance = abs(end_x - self.x_pos) + abs(end_y - self.y_pos)
+        tween = animation.Tween((self.x_pos, self.y_pos), (end_x, end_y),
+                                animation.get_move_duration(distance))
+        animation.run(tween, step)
+
+    def get_open_squares(self, /):
+        """
+        Return the list of squares, as ``(gridx, gridy)``, that self can
+        move to.
+        """
+        return self.board.game.get_open_squares(self.piece)
 
-        # Set up a game loop:
-        while not done_moving():
-            for event in pygame.event.get():
-                # Why don't we handle events here? Well, we don't
-                # currently have an easy way to, for example, show the
-                # gamepiece log from gamepieces.py, and besides, it
-                # really isn't that big of a deal. This movement will
-                # only take a little time, and the user can just wait
-                # until it is over.
-                pass
-            adjust_coord()
-            player1.board.render()
-            player2.render_pieces(view=Gamepiece.BACK_VIEW)
-            player1.render_pieces(view=view)
-            pygame.display.update()
-            pygame.time.wait(12)
-
-        self.gridx = end_gridx
-        self.gridy = end_gridy
-
-    def get_open_squares(self, /, player, opponent):
-        if self.name == "Scout":
-            return self.get_scout_squares(player, opponent)
-        else:
-            return self.get_squares(player)
-
-    def get_scout_squares(self, /, player, opnt):
-        forbidden_square = self.get_forbidden_square(player.last_two_moves)
-        def fix(row):
-            blocked = False
-            old_row = row.copy()
-            for square in old_row:
-                if player.is_square_occupied(square):
-                    blocked = True
-                if player.board.get_square(*square).lake:
-                    blocked = True
-                if blocked or square == forbidden_square:
-                    row.remove(square)
-                if opnt.is_square_occupied(square):
-                    blocked = True
-            return row
-
-        left_row = fix([(x, self.gridy) for x in range(self.gridx-1, 0, -1)])
-        right_row = fix([(x, self.gridy) for x in range(self.gridx+1, 11)])
-        top_col = fix([(self.gridx, y) for y in range(self.gridy-1, 0, -1)])
-        bottom_col = fix([(self.gridx, y) for y in range(self.gridy+1, 11)])
-        return left_row + right_row + top_col + bottom_col
-
-    def get_squares(self, /, player):
-        self.assert_active()
-        if self.name in ("Bomb", "Flag"):
-            return []
-        squares = []
-        forbidden_square = self.get_forbidden_square(player.last_two_moves)
-
-        def process_coords(coords):
-            nonlocal squares
-            square = player.board.get_square(*coords)
-            if (not player.is_square_occupied(coords) and not square.lake
-                    and coords != forbidden_square):
-                squares.append(coords)
-
-        if self.gridx != 1:
-            coords = self.gridx - 1, self.gridy
-            process_coords(coords)
-        if self.gridx != 10:
-            coords = self.gridx + 1, self.gridy
-            process_coords(coords)
-        if self.gridy != 1:
-            coords = self.gridx, self.gridy - 1
-            process_coords(coords)
-        if self.gridy != 10:
-            coords = self.gridx, self.gridy + 1
-            process_coords(coords)
-        return squares
-
-    def hovered(self, /):
-        mouse = pygame.mouse.get_pos()
-        return (self.x_pos + SQUARE_SIZE > mouse[0] > self.x_pos
-                and self.y_pos + SQUARE_SIZE > mouse[1] > self.y_pos)
+    def hovered(self, /, pos=None):
+        mouse = pos or pygame.mouse.get_pos()
+        size = self.board.square_size
+        return (self.x_pos + size > mouse[0] > self.x_pos
+                and self.y_pos + size > mouse[1] > self.y_pos)
 
     def inverted_image(self, /):
-        return flip_img(self.filename)
+        return self.atlas.image(Atlas.MIRRORED, self.name)
 
     def get_name(self, /, font_size=20):
         """
@@ -239,40 +249,22 @@ class Gamepiece:
         except ValueError as e:
             raise ValueError("Gamepiece.get_name() expected int-like object, "
                              f"got {font_size!r}") from e
-        font = pygame.font.SysFont(DEFAULT_FONT, font_size)
-        return font.render(self.name, True, self.color)
+        font = get_font(DEFAULT_FONT, font_size)
+        return render_text(font, self.name, True, self.color)
 
     def die(self, /):
+        """
+        Take self off the display, once the engine has taken it off the
+        board.
+        """
         self.x_pos = None
         self.y_pos = None
-        self.gridx = None
-        self.gridy = None
-        self.state = Gamepiece.KILLED
-
-    def get_forbidden_square(self, /, last_two_moves):
-        if all(last_two_moves):
-            if (last_two_moves[0][0] == last_two_moves[1][1]
-                    == (self.gridx, self.gridy) and last_two_moves[0][1]
-                    == last_two_moves[1][0]):
-                return last_two_moves[0][1]
-        return None
 
     @staticmethod
-    def get_gamepieces(color, id, display, /) -> list:
+    def get_gamepieces(side, board, color, /) -> list:
         """
         Return a list of ``stratego.gamepieces.Gamepiece`` objects in
-        the given color.
+        the given color, one for each piece of ``side`` (a
+        ``stratego.engine.Side``).
         """
-        gamepiece_list = []
-        name_list = (["Marshall"] + ["General"] + ["Colonel"]*2 + ["Major"]*3
-                     + ["Captain"]*4 + ["Lieutenant"]*4 + ["Sergeant"]*4
-                     + ["Miner"]*5 + ["Scout"]*8 + ["Spy"] + ["Bomb"]*6
-                     + ["Flag"])
-        imgname_list = get_gamepiece_imgs(color, id)
-        ml, gl, cl, mjr, cn, lt, sgt, mnr, sct, sy, bb, fg = imgname_list
-        imgname_list = ([ml] + [gl] + [cl]*2 + [mjr]*3 + [cn]*4 + [lt]*4
-                          + [sgt]*4 + [mnr]*5 + [sct]*8 + [sy] + [bb]*6 + [fg])
-        for imgname, name in zip(imgname_list, name_list):
-            gamepiece_list.append(Gamepiece(imgname, name, display, color))
-
-        return gamepiece_list
+        return [Gamepiece(piece, board, color) for piece in side.pieces]
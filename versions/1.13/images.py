@@ -1,59 +1,339 @@
-from PIL import Image as _Image
-from PIL import ImageEnhance as _ImageEnhance
-from PIL import ImageOps as _ImageOps
+# ``PIL`` is only imported when it is actually needed (when a sprite sheet
+# is not in the cache yet, or if NumPy is not available), so that warm
+# starts do not have to load it at all.
+import hashlib
+import mmap
 import os
+import struct
 
 from stratego.colors import Colors, pygame
-from stratego.backend import SESSION_ID
+from stratego.backend import prepare_surface
+from stratego import transforms
 
 LIGHTENING_FACTOR = 0.3
 GAMEPIECE_WIDTH = 50
 GAMEPIECE_HEIGHT = 70
+PIECE_NAMES = ("Marshall", "General", "Colonel", "Major", "Captain",
+               "Lieutenant", "Sergeant", "Miner", "Scout", "Spy", "Bomb",
+               "Flag")
 
+# Every gamepiece of the same color and rank looks exactly the same, so
+# there is no need for each ``Gamepiece`` to have its own copy of its
+# image. Instead, each image is stored here once, keyed by color and rank
+# name, and shared between all the pieces that need it. Since this is
+# module-level, it survives from one game to the next.
+_gamepiece_imgs = {}
+# The same goes for the lightened and mirrored versions of the images,
+# which are only computed the first time they are needed.
+_lightened_imgs = {}
+_mirrored_imgs = {}
+# The full sprite sheets, keyed by color.
+_sheets = {}
+SHEET_FILENAMES = {Colors.PLAYER_RED: "redpieces.jpg",
+                   Colors.PLAYER_BLUE: "bluepieces.jpg"}
+# The header of a cache file: the width and height of the sheet.
+CACHE_HEADER = struct.Struct("<II")
+CACHE_EXTENSION = ".cache"
 
-def lighten_image(filename: str, /) -> pygame.surface.Surface:
+
+def lighten_image(surface: pygame.surface.Surface, /
+                  ) -> pygame.surface.Surface:
     """
-    Reduce the saturation of the image at a given filename.
+    Reduce the saturation of the given image.
 
     Parameter
     ---------
-    filename: str, positional-only
+    surface: pygame.surface.Surface, positional-only
 
-    This function opens the image at the given filename and uses ``PIL`` to
-    reduce the saturation of the colors in the image. Then it creates a
-    temporary file with the reduced-color image and opens the file with
-    ``pygame`` to create a ``pygame.Surface`` object. The temporary file is
-    then deleted, and the ``pygame.Surface`` object containing the
-    reduced-color image is returned.
+    This function converts the given ``pygame.Surface`` object to a ``PIL``
+    image in memory and uses ``PIL`` to reduce the saturation of the colors
+    in the image. The reduced-color image is then converted back into a new
+    ``pygame.Surface`` object, which is returned. No files are created.
     """
-    if not isinstance(filename, str):
-        raise ValueError(f"lighten_image() expected string, got {filename!r}")
+    if not isinstance(surface, pygame.surface.Surface):
+        raise ValueError("lighten_image() expected pygame.Surface object, got "
+                         f"{surface!r}")
+
+    from PIL import ImageEnhance as _ImageEnhance
 
-    # Use PIL to reduce the saturation of the image to a new filename.
-    img = _Image.open(filename)
+    # Use PIL to reduce the saturation of the image.
+    img = surface_to_pil(surface)
     converter = _ImageEnhance.Color(img)
     new_img = converter.enhance(LIGHTENING_FACTOR)
-    # Get the original filename without the .jpg extension.
-    orig_filename = filename.split('.')[0]
-    # Save the lightened image to the old filename plus "light".
-    new_filename = f"{orig_filename}light.jpg"
-    new_img.save(new_filename)
-    # Delete all variables involved in the switch.
-    del img, converter, new_img, orig_filename
+    return pil_to_surface(new_img)
+
+
+def pil_to_surface(image, /) -> pygame.surface.Surface:
+    """
+    Return a new ``pygame.Surface`` object with the contents of the given
+    ``PIL`` image, without going through a file.
+    """
+    image = image.convert("RGB")
+    return pygame.image.frombytes(image.tobytes(), image.size, "RGB")
+
+
+def surface_to_pil(surface: pygame.surface.Surface, /):
+    """
+    Return a new ``PIL`` image with the contents of the given
+    ``pygame.Surface`` object, without going through a file.
+    """
+    from PIL import Image as _Image
+
+    data = pygame.image.tobytes(surface, "RGB")
+    return _Image.frombytes("RGB", surface.get_size(), data)
+
+
+def get_gamepiece_img(color: tuple, name: str, /) -> pygame.surface.Surface:
+    """
+    Return the shared image of the gamepiece of the given color and rank.
+
+    Parameters
+    ----------
+    color: tuple, positional-only
+        Must be either ``stratego.colors.Colors.PLAYER_RED`` or
+        ``stratego.colors.Colors.PLAYER_BLUE``
+    name: str, positional-only
+        The name of the rank, for example "Marshall" or "Scout"
+
+    The images for a color are only loaded the first time one of them is
+    asked for; after that, the same ``pygame.Surface`` object is returned
+    every time, so it must not be drawn onto.
+    """
+    if name not in PIECE_NAMES:
+        raise ValueError(f"get_gamepiece_img() got unknown rank {name!r}")
+    key = (color, name)
+    if key not in _gamepiece_imgs:
+        for rank, img in zip(PIECE_NAMES, get_gamepiece_imgs(color)):
+            _gamepiece_imgs[(color, rank)] = prepare_surface(img)
+    return _gamepiece_imgs[key]
+
+
+def get_lightened_img(color: tuple, name: str, /) -> pygame.surface.Surface:
+    """
+    Return the shared, lightened image of the gamepiece of the given color
+    and rank.
+
+    This is the same as ``lighten_image(get_gamepiece_img(color, name))``,
+    except that the lightening is only done once for each color and rank;
+    after that, the same ``pygame.Surface`` object is returned every time.
+    """
+    key = (color, name)
+    if key not in _lightened_imgs:
+        if transforms.AVAILABLE:
+            load_variants()
+        else:
+            img = get_gamepiece_img(color, name)
+            _lightened_imgs[key] = prepare_surface(lighten_image(img))
+    return _lightened_imgs[key]
+
+
+def get_mirrored_img(color: tuple, name: str, /) -> pygame.surface.Surface:
+    """
+    Return the shared, mirrored image of the gamepiece of the given color
+    and rank.
+
+    This is the same as ``flip_img(get_gamepiece_img(color, name))``, and,
+    like get_lightened_img(), it is only computed once for each color and
+    rank.
+    """
+    key = (color, name)
+    if key not in _mirrored_imgs:
+        if transforms.AVAILABLE:
+            load_variants()
+        else:
+            img = get_gamepiece_img(color, name)
+            _mirrored_imgs[key] = prepare_surface(flip_img(img))
+    return _mirrored_imgs[key]
+
+
+def decode_variants(sheets: dict, /) -> tuple:
+    """
+    Return the lightened and mirrored images of every gamepiece on the
+    given sprite sheets (a dictionary mapping colors to sheets), as two
+    dictionaries keyed by color and rank, like the registries.
+
+    This uses ``stratego.transforms``, so it can only be called if NumPy
+    is available. All the sheets are transformed in the same array
+    operation, and the results are sliced up. The images are not
+    converted to the pixel format of the display.
+    """
+    colors = list(sheets)
+    variants = transforms.make_variants(
+        [sheets[color] for color in colors], GAMEPIECE_WIDTH,
+        LIGHTENING_FACTOR)
+    lightened, mirrored = {}, {}
+    for color, sheet_variants in zip(colors, variants):
+        for images, name in ((lightened, "lightened"),
+                             (mirrored, "mirrored")):
+            pieces = slice_sheet(sheet_variants[name])
+            for rank, img in zip(PIECE_NAMES, pieces):
+                images[(color, rank)] = img
+    return lightened, mirrored
+
+
+def load_variants():
+    """
+    Create the lightened and mirrored images of every gamepiece of both
+    colors at once, and put them in the registries (see
+    ``decode_variants()``).
+    """
+    lightened, mirrored = decode_variants(
+        {color: get_sheet(color) for color in SHEET_FILENAMES})
+    for registry, images in ((_lightened_imgs, lightened),
+                             (_mirrored_imgs, mirrored)):
+        for key, img in images.items():
+            registry[key] = prepare_surface(img)
+
+
+def decode_images() -> tuple:
+    """
+    Decode both sprite sheets and cut them up into the normal, lightened
+    and mirrored images of every gamepiece, and return them as four
+    dictionaries: the sheets keyed by color, then the three kinds of
+    images keyed by color and rank.
+
+    Nothing here touches the display or the registries, and nothing is
+    converted to the pixel format of the display, so this can run in a
+    background thread (see ``stratego.atlas.start_loading()``). The
+    result is then passed to finalize_images() on the main thread.
+    """
+    sheets = {color: load_sheet(color) for color in SHEET_FILENAMES}
+    normal = {}
+    for color, sheet in sheets.items():
+        for rank, img in zip(PIECE_NAMES, slice_sheet(sheet)):
+            normal[(color, rank)] = img
+    if transforms.AVAILABLE:
+        lightened, mirrored = decode_variants(sheets)
+    else:
+        lightened = {key: lighten_image(img) for key, img in normal.items()}
+        mirrored = {key: flip_img(img) for key, img in normal.items()}
+    return sheets, normal, lightened, mirrored
+
+
+def finalize_images(decoded=None, /):
+    """
+    Put the normal, lightened and mirrored images of every gamepiece of
+    both colors in the registries, converted to the pixel format of the
+    display.
+
+    ``decoded`` is the result of decode_images(), if it has already been
+    called (for example in a background thread); otherwise the images are
+    decoded now. Call this on the main thread, once, right after the
+    display has been created. Images loaded afterwards are converted as
+    soon as they are loaded anyway.
+    """
+    if decoded is None:
+        decoded = decode_images()
+    sheets, *images = decoded
+    for color, sheet in sheets.items():
+        _sheets.setdefault(color, sheet)
+    for registry, imgs in zip((_gamepiece_imgs, _lightened_imgs,
+                               _mirrored_imgs), images):
+        for key, img in imgs.items():
+            registry[key] = prepare_surface(img)
+
+
+def get_sheet(color: tuple, /) -> pygame.surface.Surface:
+    """
+    Return the whole sprite sheet of the gamepieces in the given color, as
+    a ``pygame.Surface`` object. Each sheet is only decoded once.
+
+    The decoded sheet is also saved to a cache file next to the original
+    image (see ``load_cached_sheet()``), so later launches do not need to
+    decode the JPEG at all.
+    """
+    if color not in _sheets:
+        _sheets[color] = load_sheet(color)
+    return _sheets[color]
+
+
+def load_sheet(color: tuple, /) -> pygame.surface.Surface:
+    """
+    Decode the sprite sheet of the gamepieces in the given color, from its
+    cache file if there is one, and return it without keeping it.
+    """
+    try:
+        filename = SHEET_FILENAMES[color]
+    except KeyError:
+        raise ValueError("get_sheet() expected either ``stratego."
+                         "colors.Colors.RED`` or ``stratego.colors."
+                         f"Colors.BLUE``, got {color!r}") from None
+    # Hashing the image is not free, so it is only done once.
+    cache_filename = get_cache_filename(filename)
+    sheet = load_cached_sheet(cache_filename)
+    if sheet is None:
+        from PIL import Image as _Image
+
+        sheet = pil_to_surface(_Image.open(filename))
+        save_cached_sheet(filename, cache_filename, sheet)
+    return sheet
 
-    # Open the new image file.
-    pygame_img = pygame.image.load(new_filename)
 
-    # Delete the temporary image file.
-    # Note that we will still be able to use the image itself through
-    # the "pygame_img" object.
-    os.remove(new_filename)
+def get_cache_filename(filename: str, /) -> str:
+    """
+    Return the name of the cache file for the image at the given filename.
+
+    The name contains a hash of the image file, so if the image is ever
+    changed, the old cache file will simply not be found any more.
+    """
+    with open(filename, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    return f"{filename}.{digest}{CACHE_EXTENSION}"
+
+
+def load_cached_sheet(cache_filename: str, /):
+    """
+    Return the decoded sprite sheet stored in the given cache file (see
+    ``get_cache_filename()``), or None if there is no valid cache file.
 
-    # Return the faded image stored in "pygame_img"
-    return pygame_img
+    The cache file holds the raw RGBA pixels of the sheet, so it is
+    memory-mapped and a ``pygame.Surface`` object is made straight from
+    the mapping, without any decoding. The pixels are copied only once,
+    into the Surface that is returned.
+    """
+    try:
+        with open(cache_filename, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                width, height = CACHE_HEADER.unpack_from(data)
+                if len(data) != CACHE_HEADER.size + width * height * 4:
+                    return None
+                # The mapping can only be closed once nothing uses its
+                # memory any more, so the Surface that wraps it is
+                # copied and dropped before then.
+                with memoryview(data)[CACHE_HEADER.size:] as pixels:
+                    mapped = pygame.image.frombuffer(pixels, (width, height),
+                                                     "RGBA")
+                    sheet = mapped.copy()
+                    del mapped
+    except (OSError, ValueError, struct.error):
+        return None
+    return sheet
 
 
-def get_gamepiece_imgs(color: tuple, id, /) -> list:
+def save_cached_sheet(filename: str, cache_filename: str,
+                      sheet: pygame.surface.Surface, /):
+    """
+    Save the decoded sprite sheet for the image at the given filename to
+    the given cache file, and delete any cache files left over from older
+    versions of the image.
+
+    Failing to write the cache is not an error; the sheet will just be
+    decoded again next time.
+    """
+    try:
+        for old_filename in os.listdir('.'):
+            if (old_filename.startswith(f"{filename}.")
+                    and old_filename.endswith(CACHE_EXTENSION)
+                    and old_filename != cache_filename):
+                os.remove(old_filename)
+        with open(cache_filename, "wb") as file:
+            file.write(CACHE_HEADER.pack(*sheet.get_size()))
+            file.write(pygame.image.tobytes(sheet, "RGBA"))
+    except OSError:
+        pass
+
+
+def get_gamepiece_imgs(color: tuple, /) -> list:
     """
     Get the images of the Stratego gamepieces in the given color.
 
@@ -63,35 +343,35 @@ def get_gamepiece_imgs(color: tuple, id, /) -> list:
     Must be either ``stratego.colors.Colors.RED`` or
     ``stratego.colors.Colors.BLUE``
 
-    The function opens the file containing the images of the gamepieces in the
-    given color, and then, from the opened file, creates a list containing the
-    image for each individual gamepiece in the given color in the form of a
+    The function gets the sprite sheet of the gamepieces in the given
+    color, and then creates a list containing the image for each
+    individual gamepiece in the given color in the form of a
     ``pygame.Surface`` object. This list is
-    then returned.
+    then returned. Everything happens in memory, so no files are created.
     """
-
-    match color:
-        case Colors.PLAYER_RED:
-            image = _Image.open("redpieces.jpg")
-            return parse_image(image, id)
-        case Colors.PLAYER_BLUE:
-            image = _Image.open("bluepieces.jpg")
-            return parse_image(image, id)
-        case _:
-            raise ValueError("get_gamepiece_imgs() expected either "
-                             "``stratego.colors.Colors.RED`` or ``stratego."
-                             f"colors.Colors.BLUE``, got {color!r}")
+    return slice_sheet(get_sheet(color))
 
 
-def parse_image(image, id, /) -> list:
+def parse_image(image, /) -> list:
     """
     Return the list of the dozen different gamepieces contained in the
     image, in the order Marshall, General, Colonel, Major, Captain,
     Lieutenant, Sergeant, Miner, Scout, Spy, Bomb, Flag, all in the form of
     ``pygame.Surface`` objects.
+
+    The whole image is decoded once and then turned into a single
+    ``pygame.Surface``; each gamepiece is then copied out of it, so no
+    temporary files are needed.
+    """
+    return slice_sheet(pil_to_surface(image))
+
+
+def slice_sheet(sheet: pygame.surface.Surface, /) -> list:
+    """
+    Return the list of the dozen different gamepieces contained in the
+    sprite sheet, in the same order as ``parse_image()``.
     """
     piece_list = []
-    counter = 0
     # The gamepieces are arranged (in the image) in a 4x3 grid.
     # Each piece is 50 pixels by 70 pixels (these
     # numbers are stored in the ``stratego.backend`` module in
@@ -102,27 +382,16 @@ def parse_image(image, id, /) -> list:
     # one piece at a time.
     for x_coord in range(0, GAMEPIECE_WIDTH * 4, GAMEPIECE_WIDTH):
         for y_coord in range(0, GAMEPIECE_HEIGHT * 3, GAMEPIECE_HEIGHT):
-            right_x_coord = x_coord + GAMEPIECE_WIDTH
-            bottom_y_coord = y_coord + GAMEPIECE_HEIGHT
-            filename = f"{SESSION_ID}-gamepiece{id}{counter}.jpg"
-            # Crop the gamepiece at the given coordinates from the image
-            new = image.crop((x_coord, y_coord, right_x_coord, bottom_y_coord))
-            new.save(filename)
-            piece_list.append(filename)
-            counter += 1
+            # Copy the gamepiece at the given coordinates from the image
+            rect = (x_coord, y_coord, GAMEPIECE_WIDTH, GAMEPIECE_HEIGHT)
+            piece_list.append(sheet.subsurface(rect).copy())
 
     return piece_list
 
 
-def flip_img(filename: str, /):
+def flip_img(surface: pygame.surface.Surface, /):
     """
-    Return a pygame.Surface containing the image at the given filename
-    flipped horizontally.
+    Return a new pygame.Surface containing the given image flipped
+    horizontally.
     """
-    new_filename = f"{filename}_flipped.jpg"
-    img = _Image.open(filename)
-    new_img = _ImageOps.mirror(img)
-    new_img.save(new_filename)
-    new_img_as_surface = pygame.image.load(new_filename)
-    os.remove(new_filename)
-    return new_img_as_surface
+    return pygame.transform.flip(surface, True, False)
@@ -0,0 +1,175 @@
+"""
+Frame statistics for ``stratego``: where the time of each frame goes.
+
+Press F3 in any screen to show or hide an overlay in the top right corner
+of the display, with the statistics of the last frame:
+    - How long the frame took to draw, and how many frames are being
+      presented per second.
+    - How many times ``Surface.blit()``, ``pygame.draw.rect()`` and
+      ``Font.render()`` were called.
+    - How much of the display was updated.
+    - How long was spent in the ``render()`` closure of each screen (such
+      as ``game_intro`` or ``Player.get_move``).
+If the ``STRATEGO_FRAME_LOG`` environment variable is set to a file name,
+the same statistics are written to that file, one line per frame, for the
+whole game.
+
+The calls are counted with ``sys.setprofile()``, which is only switched on
+while the overlay is shown or the log is being written; otherwise, nothing
+is measured and nothing is slowed down.
+"""
+from stratego.backend import pygame, get_font, DEFAULT_FONT
+import os
+import sys
+import time
+
+# The C functions whose calls are counted, by their names and the types of
+# the objects they belong to, and what they are called in the statistics.
+COUNTED_CALLS = {
+    ("blit", pygame.Surface): "blit",
+    ("blits", pygame.Surface): "blit",
+    ("rect", type(pygame.draw)): "draw.rect",
+    ("render", pygame.font.Font): "font.render",
+}
+LOG_PATH = os.environ.get("STRATEGO_FRAME_LOG")
+FONT_SIZE = 14
+
+# Whether frames are being measured at all: True while the overlay is shown
+# or the log is being written.
+enabled = False
+shown = False
+_log = None
+_frame_start = 0
+_last_present = None
+_calls = {}
+_render_times = {}
+# The render() closures currently running, as (screen, start time) pairs.
+_renders = []
+# What was on the display where the overlay was last drawn, and where.
+_background = None
+
+
+def _profile(frame, event, arg):
+    if event == "c_call":
+        owner = getattr(arg, "__self__", None)
+        name = COUNTED_CALLS.get((arg.__name__, type(owner)))
+        if name:
+            _calls[name] = _calls.get(name, 0) + 1
+    elif frame.f_code.co_name == "render":
+        code = frame.f_code
+        qualname = getattr(code, "co_qualname", code.co_name)
+        if ".<locals>." not in qualname:
+            return
+        screen = qualname.split(".<locals>.")[0]
+        if event == "call":
+            _renders.append((screen, time.perf_counter()))
+        elif event == "return" and _renders:
+            screen, start = _renders.pop()
+            _render_times[screen] = (_render_times.get(screen, 0)
+                                     + time.perf_counter() - start)
+
+
+def _update():
+    """Switch measuring on or off, depending on what needs it."""
+    global enabled
+    enabled = shown or _log is not None
+    sys.setprofile(_profile if enabled else None)
+    start_frame()
+
+
+def toggle():
+    """Show the overlay if it is hidden, or hide it if it is shown."""
+    global shown
+    shown = not shown
+    _update()
+
+
+def start_logging(path, /):
+    """Write the statistics of every frame to the file at ``path``."""
+    global _log
+    _log = open(path, "a")
+    _update()
+
+
+def start_frame():
+    """
+    Start measuring a new frame. ``stratego.scheduler.get_events()`` calls
+    this once it has stopped waiting for events, so that the time spent
+    waiting does not count.
+    """
+    global _frame_start
+    _frame_start = time.perf_counter()
+    _calls.clear()
+    _render_times.clear()
+
+
+def end_frame(display, area, /):
+    """
+    Finish measuring a frame that is about to be presented, with ``area``
+    being the number of pixels of the display that will be updated, and
+    report its statistics. If the overlay is shown, draw it onto the
+    display and return the rectangle it covers (which should be updated
+    too); otherwise, return None.
+    """
+    global _last_present
+    now = time.perf_counter()
+    frame_time = now - _frame_start
+    if _last_present is None or now == _last_present:
+        fps = 0
+    else:
+        fps = 1 / (now - _last_present)
+    _last_present = now
+    lines = [f"frame {frame_time * 1000:.2f} ms  {fps:.0f} fps",
+             "calls " + "  ".join(f"{name} {_calls.get(name, 0)}"
+                                  for name in ("blit", "draw.rect",
+                                               "font.render")),
+             f"updated {area} px"]
+    for screen, seconds in _render_times.items():
+        lines.append(f"{screen}.render {seconds * 1000:.2f} ms")
+    if _log is not None:
+        _log.write(" | ".join(lines) + "\n")
+        _log.flush()
+    rect = None
+    if shown:
+        # The overlay must not count itself.
+        sys.setprofile(None)
+        rect = _draw(display, lines)
+        sys.setprofile(_profile)
+    start_frame()
+    return rect
+
+
+def _draw(display, lines, /):
+    """
+    Draw the overlay with the given lines of text onto the display,
+    keeping a copy of what was there, and return the rectangle it covers.
+    """
+    global _background
+    font = get_font(DEFAULT_FONT, FONT_SIZE)
+    texts = [font.render(line, True, (255, 255, 255)) for line in lines]
+    width = max(text.get_width() for text in texts) + 10
+    height = sum(text.get_height() for text in texts) + 10
+    rect = pygame.Rect(display.get_width() - width, 0, width, height)
+    rect = rect.clip(display.get_rect())
+    _background = display.subsurface(rect).copy(), rect
+    display.fill((0, 0, 0), rect)
+    y = 5
+    for text in texts:
+        display.blit(text, (rect.x + 5, y))
+        y += text.get_height()
+    return rect
+
+
+def restore(display, /):
+    """
+    Put back what was under the overlay once the display has been
+    updated, so that the screen's own drawing is left as it was.
+    """
+    global _background
+    if _background is not None:
+        display.blit(*_background)
+        _background = None
+
+
+if LOG_PATH:
+    start_logging(LOG_PATH)
@@ -1,8 +1,9 @@
 from stratego.colors import pygame, Colors
 from stratego.gamepieces import Gamepiece
 from stratego.backend import (
-    wait,
     center_text,
+    render_text,
+    get_font,
     exit_game,
     notify_about_click,
     EVENTS,
@@ -11,7 +12,15 @@ from stratego.backend import (
 from stratego.entries import Entry
 from stratego.buttons import Button
 from stratego.boards import Board, Square
-from stratego.game_loops import show_gamepiece_log, show_ranks, warn_to_leave
+from stratego.atlas import wait_for_assets
+from stratego.compositor import Compositor, fill_white
+from stratego.scheduler import get_events, present, run, IDLE_TIMEOUT
+from stratego.game_loops import (
+    show_gamepiece_log,
+    show_ranks,
+    warn_to_leave,
+    handle_pause_event
+)
 import random
 
 
@@ -42,11 +51,22 @@ class Player(Colors):
         self.color = Player.colors.pop(0)
         if self.color == Colors.PLAYER_RED: self.boardsection = Board.FRONT
         else: self.boardsection = Board.BACK
-        self.last_two_moves = None, None
-        self.pieces = Gamepiece.get_gamepieces(self.color, self.id,
-                                               self.display)
+        # The player's side in the game on the board (see
+        # ``stratego.engine``), which knows where the pieces are.
+        self.side = board.game.add_side()
+        self.pieces = Gamepiece.get_gamepieces(self.side, self.board,
+                                               self.color)
+        self.views = {piece.piece: piece for piece in self.pieces}
+        # The layers of the player's screens; they are allocated once, and
+        # each screen gives them its own draw functions (see setup() and
+        # get_move()).
+        self.compositor = Compositor(display)
+
+    @property
+    def last_two_moves(self, /):
+        return self.side.last_two_moves
 
-    def render_pieces(self, /, view=Gamepiece.NORMAL):
+    def render_pieces(self, /, view=Gamepiece.NORMAL, surface=None):
         if view not in (Gamepiece.NORMAL, Gamepiece.LIGHTENED,
                         Gamepiece.BACK_VIEW):
             raise ValueError("Player.render_pieces() expected value of 0, 1, "
@@ -54,7 +74,7 @@ class Player(Colors):
                              f"{view}")
         for piece in self.pieces:
             if piece.state == Gamepiece.ACTIVE:
-                piece.render(view=view)
+                piece.render(view=view, surface=surface)
 
     def get_name(self, /, forbidden_name=None):
         """
@@ -69,9 +89,9 @@ class Player(Colors):
         """
         if forbidden_name:
             forbidden_name = str(forbidden_name)
-        font = pygame.font.SysFont(DEFAULT_FONT, 20)
-        text = font.render(f"Player {self.id}, enter your name:", True,
-                           Colors.BLACK)
+        font = get_font(DEFAULT_FONT, 20)
+        text = render_text(font, f"Player {self.id}, enter your name:", True,
+                                 Colors.BLACK)
         text_y = int(self.display_height/2 - 60)
         button_x = self.display_width/2 - 50
         button_y = self.display_height/2 + 50
@@ -79,19 +99,22 @@ class Player(Colors):
         y_pos = int(self.display_height/2 - 25)
         entry = Entry(self.display, x_pos, y_pos, 350, 50)
         entry.render()
+        submit_button = Button("Submit", button_x, button_y, 100, 50,
+                               Colors.DULL_GREEN, Colors.GREEN, self.display,
+                               notify_about_click, (True,))
 
         def render():
             self.display.fill(Colors.WHITE)
             entry.render()
             center_text(text, self.display, y=text_y)
-            Button.clear_all_buttons()
-            Button("Submit", button_x, button_y, 100, 50,
-                   Colors.DULL_GREEN, Colors.GREEN, self.display,
-                   notify_about_click, (True,))
+            Button.show_buttons(submit_button)
 
         render()
         while True:
-            for event in pygame.event.get():
+            # While Backspace is held down, the entry field deletes a
+            # letter on every frame, so do not wait for events then.
+            timeout = 0 if entry.backspace else IDLE_TIMEOUT
+            for event in get_events(timeout):
                 give_to_entry = True
                 if event.type == pygame.QUIT:
                     exit_game()
@@ -103,7 +126,7 @@ class Player(Colors):
                         else:
                             render()
                 elif event.type == pygame.MOUSEBUTTONUP:
-                    if Button.process_click():
+                    if Button.process_click(event.pos):
                         entry.complete = True
                 elif event.type in EVENTS:
                     render()
@@ -118,63 +141,77 @@ class Player(Colors):
                         self.playername = entry.text
                         return
                     else:
-                        font = pygame.font.SysFont(DEFAULT_FONT, 15)
-                        text = font.render("That name's taken!", True,
-                                           Colors.BLACK)
+                        font = get_font(DEFAULT_FONT, 15)
+                        text = render_text(font, "That name's taken!", True,
+                                                 Colors.BLACK)
                         text_y = self.display_height/2 + 115
                         center_text(text, self.display, y=text_y)
                 entry.complete = False
             Button.listen()
-            pygame.display.update()
-            pygame.time.wait(10)
+            present()
 
     def setup(self, /):
+        # This is the first time the gamepieces are drawn, so their images
+        # must be ready by now.
+        wait_for_assets()
         text_size = int(self.board.CONSTANT / 15)
         name = self.name(text_size, with_comma=True)
         rect = name.get_rect()
         x = self.board.x/2
         rect.centerx = x
         rect.centery = 30
-        font = pygame.font.SysFont(DEFAULT_FONT, text_size)
+        font = get_font(DEFAULT_FONT, text_size)
         textlist = (
-            font.render("set up your pieces!", True, Colors.BLACK),
-            font.render("Select two pieces at a", True, Colors.BLACK),
-            font.render("time to switch them.", True, Colors.BLACK),
+            render_text(font, "set up your pieces!", True, Colors.BLACK),
+            render_text(font, "Select two pieces at a", True, Colors.BLACK),
+            render_text(font, "time to switch them.", True, Colors.BLACK),
         )
         squares = self.board.get_starting_squares(self.boardsection)
         for piece, square in zip(self.pieces, squares):
             coords = square.get_coords()
+            self.board.game.place(piece.piece, coords[2:])
             piece.x_pos = coords[0]
             piece.y_pos = coords[1]
-            piece.gridx = coords[2]
-            piece.gridy = coords[3]
             piece.initialx = coords[0]
             piece.initialy = coords[1]
-            piece.state = Gamepiece.ACTIVE
 
-        def render():
-            self.display.fill(Colors.WHITE)
-            self.display.blit(name, rect)
+        def draw_hud(surface):
+            surface.blit(name, rect)
             y = text_size/2 + 36
             for text in textlist:
                 textrect = text.get_rect()
                 textrect.centerx = x
                 textrect.top = y
-                self.display.blit(text, textrect)
+                surface.blit(text, textrect)
                 y += text_size + 6
-            Button.clear_all_buttons()
-            Button("Done!", x-50, self.display_height/2, 100, 50,
-                     Colors.DULL_GREEN, Colors.GREEN, self.display,
-                     notify_about_click, (True,))
-            self.board.render()
-            self.render_pieces()
+
+        board_rect = self.board.get_rect()
+        compositor = self.compositor
+        compositor.set_layer(Compositor.BACKGROUND, fill_white, opaque=True)
+        compositor.set_layer(Compositor.BOARD, self.board.render_base,
+                             opaque=True, rect=board_rect)
+        compositor.set_layer(Compositor.HIGHLIGHTS,
+                             self.board.render_selected, rect=board_rect)
+        compositor.set_layer(Compositor.PIECES,
+                             lambda surface: self.render_pieces(
+                                 surface=surface), rect=board_rect)
+        compositor.set_layer(Compositor.HUD, draw_hud,
+                             rect=self.board.get_side_rect())
+
+        done_button = Button("Done!", x-50, self.display_height/2, 100, 50,
+                             Colors.DULL_GREEN, Colors.GREEN, self.display,
+                             notify_about_click, (True,))
+
+        def render():
+            compositor.refresh()
+            Button.show_buttons(done_button)
         render()
         pieces_selected = []
         squares_selected = []
         done = False
 
         while True:
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == pygame.QUIT:
                     exit_game()
                 elif event.type == pygame.KEYDOWN:
@@ -190,46 +227,37 @@ class Player(Colors):
                         show_ranks(self.display, self)
                         render()
                 elif event.type == pygame.MOUSEBUTTONUP:
-                    for piece in self.pieces:
-                        if piece.hovered():
-                            for square in self.board.squares:
-                                if square.get_coords() == piece.get_pos():
-                                    squares_selected.append(square)
-                                    square.selected = True
-                                    square.render()
-                            piece.render()
-                            pieces_selected.append(piece)
-                    if Button.process_click():
+                    coords = self.board.grid_pos(event.pos)
+                    piece = coords and self.pieceat(coords)
+                    if piece:
+                        square = self.board.get_square(*coords)
+                        squares_selected.append(square)
+                        square.selected = True
+                        compositor.invalidate(Compositor.HIGHLIGHTS)
+                        pieces_selected.append(piece)
+                    if Button.process_click(event.pos):
                         done = True
                 elif event.type in EVENTS:
                     render()
             if len(squares_selected) == 2:
                 for square in squares_selected:
                     square.selected = False
-                    square.render()
                 piece1 = pieces_selected[0]
                 piece2 = pieces_selected[1]
-                piece1_old_coords = piece1.get_pos()
-                piece2_old_coords = piece2.get_pos()
-                piece1.x_pos = piece2_old_coords[0]
-                piece1.y_pos = piece2_old_coords[1]
-                piece1.gridx = piece2_old_coords[2]
-                piece1.gridy = piece2_old_coords[3]
-                piece1.render()
-                piece2.x_pos = piece1_old_coords[0]
-                piece2.y_pos = piece1_old_coords[1]
-                piece2.gridx = piece1_old_coords[2]
-                piece2.gridy = piece1_old_coords[3]
-                piece2.render()
+                self.board.game.swap(piece1.piece, piece2.piece)
+                piece1.x_pos, piece2.x_pos = piece2.x_pos, piece1.x_pos
+                piece1.y_pos, piece2.y_pos = piece2.y_pos, piece1.y_pos
+                compositor.invalidate(Compositor.HIGHLIGHTS,
+                                      Compositor.PIECES)
                 pieces_selected = []
                 squares_selected = []
+            compositor.render()
             if done:
                 for square in self.board.squares:
                     square.selected = False
                 return
             Button.listen()
-            pygame.display.update()
-            pygame.time.wait(10)
+            present()
 
     def get_move(self, /, opnt):
         text_size = int(self.board.CONSTANT / 13)
@@ -238,9 +266,9 @@ class Player(Colors):
         rect = name.get_rect()
         rect.centerx = self.board.x/2
         rect.centery = 30
-        font = pygame.font.SysFont(DEFAULT_FONT, text_size)
-        text = font.render("select a piece", True, Colors.BLACK)
-        text2 = font.render("and move it.", True, Colors.BLACK)
+        font = get_font(DEFAULT_FONT, text_size)
+        text = render_text(font, "select a piece", True, Colors.BLACK)
+        text2 = render_text(font, "and move it.", True, Colors.BLACK)
         textrect = text.get_rect()
         textrect2 = text2.get_rect()
         textrect.centerx = self.board.x/2
@@ -248,44 +276,82 @@ class Player(Colors):
         textrect.centery = 66
         textrect2.centery = 102
 
+        # The squares that are highlighted, mapped to how they are
+        # highlighted (``Square.ACTIVE`` or ``Square.STRIKE``).
+        highlights = {}
+
+        def draw_hud(surface):
+            surface.blit(name, rect)
+            surface.blit(text, textrect)
+            surface.blit(text2, textrect2)
+
+        def draw_highlights(surface):
+            for square, mode in highlights.items():
+                square.render(mode, surface)
+
+        def draw_pieces(surface):
+            self.render_pieces(surface=surface)
+            opnt.render_pieces(view=Gamepiece.BACK_VIEW, surface=surface)
+
+        board_rect = self.board.get_rect()
+        compositor = self.compositor
+        compositor.set_layer(Compositor.BACKGROUND, fill_white, opaque=True)
+        compositor.set_layer(Compositor.BOARD, self.board.render,
+                             opaque=True, rect=board_rect)
+        compositor.set_layer(Compositor.HIGHLIGHTS, draw_highlights,
+                             rect=board_rect)
+        compositor.set_layer(Compositor.PIECES, draw_pieces, rect=board_rect)
+        compositor.set_layer(Compositor.HUD, draw_hud,
+                             rect=self.board.get_side_rect())
+
+        def highlight(squares):
+            """Highlight only the given squares, and no others."""
+            for square in highlights:
+                square.state = Square.NORMAL
+            highlights.clear()
+            highlights.update(squares)
+            compositor.invalidate(Compositor.HIGHLIGHTS)
+
         def render():
             nonlocal piece_slcted
             piece_slcted = ()
-            self.display.fill(Colors.WHITE)
-            self.display.blit(name, rect)
-            self.display.blit(text, textrect)
-            self.display.blit(text2, textrect2)
-            self.board.render()
-            self.render_pieces()
-            opnt.render_pieces(view=Gamepiece.BACK_VIEW)
-
-        def process_mouseclick():
+            highlight({})
+            compositor.refresh()
+
+        def process_mouseclick(pos):
             if piece_slcted:
-                for square in open_squares:
-                    if square.hovered():
-                        strike = False
-                        if square.state == Square.STRIKE:
-                            strike = True
-                            text = font.render("STRIKE!", True, Colors.BLACK)
-                            center_text(text, self.display, x=self.board.x / 2)
-                        for open_square in open_squares:
-                            open_square.render()
-                        open_squares.remove(square)
-                        coords = square.get_coords()[2:]
-                        piece = piece_slcted[0]
-                        move = ((piece.gridx, piece.gridy), coords)
-                        self.last_two_moves = self.last_two_moves[1], move
-                        piece.move(square, self, opnt)
-                        if strike:
+                square = self.board.square_at(pos)
+                if square in open_squares:
+                    coords = square.get_coords()[2:]
+                    # The highlights may not have been drawn yet, if both
+                    # clicks came in the same batch of events, so the
+                    # square's state cannot be trusted here.
+                    strike = opnt.is_square_occupied(coords)
+                    if strike:
+                        text = render_text(font, "STRIKE!", True,
+                                           Colors.BLACK)
+                        center_text(text, self.display, x=self.board.x / 2)
+                    highlight({})
+                    compositor.render()
+                    open_squares.remove(square)
+                    piece = piece_slcted[0]
+                    # The strike, if there is one, is decided once the
+                    # other player has seen the move (see show_move()).
+                    self.board.game.move(piece.piece, coords)
+                    piece.move(square, self, opnt)
+                    if strike:
+                        def show_strike():
                             square.render(mode=Square.STRIKE)
-                            pygame.display.update()
-                            wait(1500)
-                        return True
+                            yield 1500
+                        run(show_strike(),
+                            lambda event: handle_pause_event(self.display,
+                                                             event))
+                    return True
             return False
         render()
 
         while True:
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if warn_to_leave(self.display):
@@ -299,66 +365,51 @@ class Player(Colors):
                         show_gamepiece_log(self.display, self, opnt)
                         render()
                 elif event.type == pygame.MOUSEBUTTONUP:
-                    if process_mouseclick():
+                    if process_mouseclick(event.pos):
                         return
-                    for piece in self.active_pieces():
-                        if piece.hovered():
-                            if piece_slcted:
-                                for square in open_squares:
-                                    square.render()
-                                    enemy_piece = opnt.pieceat(square)
-                                    if enemy_piece:
-                                        enemy_piece.render(
-                                            view=Gamepiece.BACK_VIEW)
-                            open_squares = piece.get_open_squares(self, opnt)
-                            open_squares = [self.board.get_square(*coords)
-                                            for coords in open_squares]
-                            if open_squares:
-                                pos = piece.get_pos()[2:]
-                                piece_slcted = (piece,
-                                                self.board.get_square(*pos))
-                                for square in open_squares:
-                                    coords = square.get_coords()[2:]
-                                    if opnt.is_square_occupied(coords):
-                                        square.render(Square.STRIKE)
-                                    else:
-                                        square.render(Square.ACTIVE)
+                    coords = self.board.grid_pos(event.pos)
+                    piece = coords and self.pieceat(coords)
+                    if piece:
+                        if piece_slcted:
+                            highlight({})
+                        open_squares = piece.get_open_squares()
+                        open_squares = [self.board.get_square(*coords)
+                                        for coords in open_squares]
+                        if open_squares:
+                            pos = piece.get_pos()[2:]
+                            piece_slcted = (piece,
+                                            self.board.get_square(*pos))
+                            squares = {}
+                            for square in open_squares:
+                                coords = square.get_coords()[2:]
+                                if opnt.is_square_occupied(coords):
+                                    squares[square] = Square.STRIKE
+                                else:
+                                    squares[square] = Square.ACTIVE
+                            highlight(squares)
                 elif event.type == pygame.QUIT:
                     exit_game()
                 elif event.type in EVENTS:
                     render()
-            pygame.display.update()
-            pygame.time.wait(10)
+            compositor.render()
+            present()
 
     def is_square_occupied(self, /, coords):
         if isinstance(coords, Square):
             coords = coords.get_coords()[2:]
-        for piece in self.active_pieces():
-            if piece.get_pos()[2:] == coords:
-                return True
-        return False
+        return self.side.is_square_occupied(coords)
 
     def pieceat(self, /, coords):
         if isinstance(coords, Square):
             coords = coords.get_coords()[2:]
-        for piece in self.active_pieces():
-            if piece.get_pos()[2:] == coords:
-                return piece
-        return None
+        piece = self.side.pieceat(coords)
+        return piece and self.views[piece]
 
     def active_pieces(self, /):
-        pieces = []
-        for piece in self.pieces:
-            if piece.state == Gamepiece.ACTIVE:
-                pieces.append(piece)
-        return pieces
+        return [self.views[piece] for piece in self.side.active_pieces()]
 
-    def has_movable_pieces(self, /, opnt):
-        for piece in self.pieces:
-            if piece.state == Gamepiece.ACTIVE:
-                if piece.get_open_squares(self, opnt):
-                    return True
-        return False
+    def has_movable_pieces(self, /):
+        return self.side.has_movable_pieces()
 
     def name(self, /, font_size=20, with_comma=False):
         """
@@ -370,9 +421,9 @@ class Player(Colors):
         except ValueError as e:
             raise ValueError("Player.get_name() expected int-like object, "
                              f"got {font_size!r}") from e
-        font = pygame.font.SysFont(DEFAULT_FONT, font_size)
+        font = get_font(DEFAULT_FONT, font_size)
         if with_comma:
             text = self.playername + ','
         else:
             text = self.playername
-        return font.render(text, True, self.color)
+        return render_text(font, text, True, self.color)
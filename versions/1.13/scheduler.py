@@ -0,0 +1,131 @@
+"""
+Event handling and frame presentation for the loops of ``stratego``.
+
+Rather than polling for events and updating the whole display a hundred
+times a second, every screen's loop waits for the next event with
+``get_events()`` and then calls ``present()``, which only updates the
+display if something may have been drawn since the last time. So, when
+nobody is touching the mouse or the keyboard, the game sleeps.
+
+How to use ``stratego.scheduler``
+---------------------------------
+>>> while True:
+...     for event in get_events():
+...         ...
+...     Button.listen()
+...     present()
+Anything that draws onto the display without being caused by an event
+(for example, a button changing color because the mouse moved over it)
+should call ``mark_dirty()``.
+
+Sequences of steps with pauses in between (such as revealing the two
+gamepieces in a strike) are written as generators that yield how many
+milliseconds to wait before the next step, and played with ``run()``,
+which keeps handling events during the pauses instead of ignoring them.
+"""
+from stratego.backend import pygame
+from stratego import overlay
+
+# How long, in milliseconds, get_events() waits for an event before giving
+# up, so that loops still run now and then when nothing happens.
+IDLE_TIMEOUT = 500
+
+# Whether anything may have been drawn since the display was last updated.
+_dirty = True
+
+
+def mark_dirty():
+    """Make the next call to present() update the display."""
+    global _dirty
+    _dirty = True
+
+
+def get_events(timeout=IDLE_TIMEOUT, /):
+    """
+    Wait until there is at least one event, or until ``timeout``
+    milliseconds have passed, and return the list of events.
+
+    With a ``timeout`` of 0, do not wait at all; this is for loops that
+    have something to do on every frame.
+
+    Any event except mouse motion may lead to something being drawn, so
+    they all make the next present() update the display. (Mouse motion
+    only matters to buttons, which call mark_dirty() themselves when they
+    change color.)
+    """
+    events = pygame.event.get()
+    if not events and timeout:
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            events = [event] + pygame.event.get()
+    if overlay.enabled:
+        overlay.start_frame()
+    for event in events:
+        if event.type != pygame.MOUSEMOTION:
+            mark_dirty()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            overlay.toggle()
+    return events
+
+
+def present(rects=None, /):
+    """
+    Update the display, but only if anything may have been drawn onto it
+    since it was last updated.
+
+    If a list of rectangles is given, update just those parts of the
+    display, right away; this is for animations, which know exactly what
+    they have drawn.
+
+    Return True if the display was updated.
+    """
+    global _dirty
+    if rects is None:
+        if not _dirty:
+            return False
+        _dirty = False
+    if overlay.enabled:
+        display = pygame.display.get_surface()
+        if rects is None:
+            area = display.get_width() * display.get_height()
+        else:
+            area = sum(rect.width * rect.height for rect in rects)
+        overlay_rect = overlay.end_frame(display, area)
+        if overlay_rect and rects is not None:
+            rects = [*rects, overlay_rect]
+    if rects is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(rects)
+    if overlay.shown:
+        overlay.restore(display)
+    return True
+
+
+def run(coroutine, on_event, /):
+    """
+    Play a sequence of steps with pauses between them, and return when it
+    is over.
+
+    ``coroutine`` is a generator that draws one step each time it is
+    resumed, and yields how many milliseconds to wait before the next one.
+    While it waits, every event is passed to ``on_event``, so the players
+    can still close the game or the window in the middle of it. Time spent
+    inside ``on_event`` (for example, in the "Do you want to close game?"
+    box) does not count towards the pause.
+    """
+    for delay in coroutine:
+        # The step probably drew something.
+        mark_dirty()
+        due = pygame.time.get_ticks() + delay
+        while True:
+            present()
+            remaining = due - pygame.time.get_ticks()
+            if remaining <= 0:
+                break
+            for event in get_events(remaining):
+                start = pygame.time.get_ticks()
+                on_event(event)
+                due += pygame.time.get_ticks() - start
+    mark_dirty()
+    present()
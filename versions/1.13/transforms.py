@@ -0,0 +1,125 @@
+"""
+Whole-sprite-sheet color transforms for the gamepiece images.
+
+Instead of changing the gamepiece images one at a time with ``PIL``, the
+functions in this module work on entire sprite sheets at once, as NumPy
+arrays of their raw RGBA pixels. Several sheets (for example, the red and
+the blue one) can be stacked and transformed in a single operation.
+
+NumPy is optional. If it is not installed, ``AVAILABLE`` is False and the
+rest of ``stratego`` falls back to ``PIL`` instead of using this module.
+"""
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+from stratego.colors import pygame
+
+AVAILABLE = _numpy is not None
+# The same weights PIL uses to convert an RGB image to grayscale.
+GRAY_WEIGHTS = (0.299, 0.587, 0.114)
+# How many pixels ``desaturate()`` converts at a time. Small blocks keep its
+# float32 temporaries in the CPU cache, and out of freshly mapped memory.
+CHUNK_SIZE = 4096
+
+
+def sheets_to_array(sheets, /):
+    """
+    Stack the given ``pygame.Surface`` objects, which must all be the same
+    size, into one array of shape (number of sheets, height, width, 4).
+
+    The pixels are copied out of each sheet as raw RGBA bytes, which for
+    32-bit surfaces is a plain copy, unlike RGB or
+    ``pygame.surfarray.array3d()``.
+    """
+    width, height = sheets[0].get_size()
+    return _numpy.stack([
+        _numpy.frombuffer(pygame.image.tobytes(sheet, "RGBA"), _numpy.uint8
+                          ).reshape(height, width, 4)
+        for sheet in sheets
+    ])
+
+
+def array_to_surfaces(array, /) -> list:
+    """
+    Undo ``sheets_to_array()``, returning a list of new Surfaces.
+
+    The Surfaces are not copies: they draw their pixels straight from
+    ``array``, which must be C-contiguous and must not be changed while
+    they are in use.
+    """
+    height, width = array.shape[-3:-1]
+    return [pygame.image.frombuffer(sheet, (width, height), "RGBA")
+            for sheet in array]
+
+
+def desaturate(array, factor, /):
+    """
+    Return a copy of ``array`` with its saturation multiplied by ``factor``.
+
+    A factor of 0 gives a grayscale image and a factor of 1 gives the
+    original image, just like ``PIL.ImageEnhance.Color``; the alpha
+    channel is kept as it is. All the maths is done in float32.
+    """
+    # Each new pixel is the old one times this matrix: ``factor`` of the
+    # old color plus ``1 - factor`` of its gray. One matrix product over
+    # the flattened pixels is much faster than broadcasting the gray back
+    # over the channels.
+    matrix = _numpy.zeros((4, 4), dtype=_numpy.float32)
+    matrix[:3, :3] = _numpy.array(GRAY_WEIGHTS, dtype=_numpy.float32
+                                  )[:, _numpy.newaxis] * (1 - factor)
+    matrix[_numpy.arange(3), _numpy.arange(3)] += factor
+    matrix[3, 3] = 1
+    pixels = array.reshape(-1, 4)
+    result = _numpy.empty_like(pixels)
+    for start in range(0, len(pixels), CHUNK_SIZE):
+        chunk = pixels[start:start + CHUNK_SIZE].astype(_numpy.float32)
+        # The weights of each column add up to 1, so the result stays
+        # between 0 and 255 and needs no clipping.
+        result[start:start + CHUNK_SIZE] = chunk @ matrix
+    return result.reshape(array.shape)
+
+
+def mirror(array, cell_width, /):
+    """
+    Return ``array`` with each ``cell_width``-pixel-wide column of sprites
+    flipped horizontally, without moving the sprites themselves.
+    """
+    # Each RGBA pixel is viewed as a single uint32, so that the flip copies
+    # whole pixels rather than single bytes.
+    *leading, height, width, channels = array.shape
+    cells = array.view(_numpy.uint32).reshape(
+        *leading, height, width // cell_width, cell_width)
+    flipped = _numpy.ascontiguousarray(cells[..., ::-1])
+    return flipped.view(_numpy.uint8).reshape(array.shape)
+
+
+def make_variants(sheets, cell_width, lightening_factor, /) -> list:
+    """
+    Return the variants of every given sprite sheet that the atlases use.
+
+    Parameters
+    ----------
+    sheets: positional-only
+        A sequence of ``pygame.Surface`` objects of the same size.
+    cell_width: positional-only
+        The width of a single sprite on the sheets.
+    lightening_factor: positional-only
+        The saturation factor to use for the "lightened" variant.
+
+    The result is a list with one dictionary per sheet, mapping the names
+    "lightened" and "mirrored" to new ``pygame.Surface`` objects with the
+    whole sheet transformed. All the sheets are transformed together, one
+    array operation per variant.
+    """
+    array = sheets_to_array(sheets)
+    variants = {
+        "lightened": desaturate(array, lightening_factor),
+        "mirrored": mirror(array, cell_width),
+    }
+    result = [{} for sheet in sheets]
+    for name, variant in variants.items():
+        for index, surface in enumerate(array_to_surfaces(variant)):
+            result[index][name] = surface
+    return result